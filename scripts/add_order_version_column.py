@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Migration script: add `version` to Order (with index ix_order_version) and the
+OrderVersion counter table used by GET /orders/changes and order-delta events.
+New databases get both from Base.metadata.create_all() at startup.
+
+Existing orders keep version 0; the counter row is created here (and at app
+startup) and hands out 1 with the next change.
+Run from project root: python scripts/add_order_version_column.py
+"""
+import sys
+from pathlib import Path
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from flask import Flask
+from sqlalchemy import inspect, text
+from config import Config
+import infrastructure.databases as databases
+from infrastructure.databases import init_db, get_session
+import infrastructure.models  # noqa: F401 - register all tables before create_all
+from infrastructure.models.order_model import OrderModel
+from services.order_service import ensure_order_version_counter
+
+def run():
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    # Creates missing tables (OrderVersion, or everything on a new database)
+    init_db(app)
+    engine = databases.engine
+    inspector = inspect(engine)
+    
+    columns = [column['name'] for column in inspector.get_columns('Order')]
+    if 'version' in columns:
+        print('Order.version already exists')
+    else:
+        table = engine.dialect.identifier_preparer.quote('Order')
+        with engine.begin() as conn:
+            # No COLUMN keyword: accepted by SQLite, PostgreSQL, MySQL and MSSQL
+            conn.execute(text(f'ALTER TABLE {table} ADD version INTEGER DEFAULT 0 NOT NULL'))
+        print('Added column Order.version')
+    
+    for index in OrderModel.__table__.indexes:
+        if index.name == 'ix_order_version':
+            index.create(bind=engine, checkfirst=True)
+            print('Order.ix_order_version: OK')
+    
+    with app.app_context():
+        session = get_session()
+        try:
+            ensure_order_version_counter(session)
+            session.commit()
+        finally:
+            session.close()
+    print('OrderVersion counter: OK')
+    print('Order version migration done.')
+
+if __name__ == '__main__':
+    run()
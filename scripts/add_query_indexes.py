@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Migration script: create the secondary indexes declared on the models
+(Order, Dish, DishSnapshot, Guest, RefreshToken) on an existing database.
+New databases get them from Base.metadata.create_all() at startup.
+
+Works on SQLite, PostgreSQL and MSSQL (indexes that already exist are skipped).
+Run from project root: python scripts/add_query_indexes.py
+
+Check that the hot queries use the indexes (SQLite and PostgreSQL):
+    python scripts/add_query_indexes.py --explain
+"""
+import sys
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from flask import Flask
+from sqlalchemy import text
+from config import Config
+import infrastructure.databases as databases
+from infrastructure.databases import init_db
+from infrastructure.databases.base import Base
+import infrastructure.models  # noqa: F401 - register all tables on Base.metadata
+
+# (description, SQL, params, indexes the plan may use)
+HOT_QUERIES = [
+    (
+        'GET /orders date window',
+        'SELECT id FROM "Order" WHERE created_at >= :from_date AND created_at <= :to_date ORDER BY created_at DESC',
+        {'from_date': datetime.utcnow() - timedelta(days=1), 'to_date': datetime.utcnow()},
+        ['ix_order_created_at']
+    ),
+    (
+        'pay_orders_service',
+        'SELECT id FROM "Order" WHERE guest_id = :guest_id AND status IN (\'Pending\', \'Processing\', \'Delivered\')',
+        {'guest_id': 1},
+        ['ix_order_guest_id_status']
+    ),
+    (
+        'guest_get_orders_service',
+        'SELECT id FROM "Order" WHERE guest_id = :guest_id',
+        {'guest_id': 1},
+        ['ix_order_guest_id_status']
+    ),
+    (
+        'Serving orders in a date window',
+        'SELECT DISTINCT table_number FROM "Order" WHERE status IN (\'Pending\', \'Processing\', \'Delivered\') '
+        'AND created_at >= :from_date AND created_at <= :to_date',
+        {'from_date': datetime.utcnow() - timedelta(days=1), 'to_date': datetime.utcnow()},
+        ['ix_order_status_created_at', 'ix_order_created_at']
+    ),
+    (
+        'Orders of a table',
+        'SELECT id FROM "Order" WHERE table_number = :table_number',
+        {'table_number': 1},
+        ['ix_order_table_number']
+    ),
+    (
+        'GET /dishes available menu',
+        'SELECT id FROM "Dish" WHERE status = :status ORDER BY created_at DESC',
+        {'status': 'Available'},
+        ['ix_dish_status', 'ix_dish_created_at']
+    ),
+    (
+        'GET /dishes?category=',
+        'SELECT id FROM "Dish" WHERE category = :category',
+        {'category': 'main'},
+        ['ix_dish_category']
+    ),
+    (
+        'Snapshots of a dish',
+        'SELECT id FROM "DishSnapshot" WHERE dish_id = :dish_id',
+        {'dish_id': 1},
+        ['ix_dish_snapshot_dish_id']
+    ),
+    (
+        'Guests of a table',
+        'SELECT id FROM "Guest" WHERE table_number = :table_number',
+        {'table_number': 1},
+        ['ix_guest_table_number']
+    ),
+    (
+        'auto_remove_refresh_token_job',
+        'SELECT token FROM "RefreshToken" WHERE expires_at < :now',
+        {'now': datetime.utcnow()},
+        ['ix_refresh_token_expires_at']
+    ),
+]
+
+def create_indexes(engine):
+    """Create every index declared on the models, skipping existing ones"""
+    # init_db() already created missing tables (with their indexes), only old tables can lack some
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            index.create(bind=engine, checkfirst=True)
+            print(f'{table.name}.{index.name}: OK')
+
+def explain_hot_queries(engine):
+    """Print the plan of each hot query and whether it uses one of the expected indexes"""
+    dialect = engine.dialect.name
+    if dialect not in ('sqlite', 'postgresql'):
+        print(f'EXPLAIN check supports SQLite and PostgreSQL, not {dialect}.')
+        return True
+
+    all_ok = True
+    with engine.connect() as conn:
+        if dialect == 'postgresql':
+            # Small tables are always seq-scanned; ask whether an index path exists at all
+            conn.execute(text('SET enable_seqscan = off'))
+        for description, sql, params, expected in HOT_QUERIES:
+            prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+            rows = conn.execute(text(prefix + sql), params).fetchall()
+            plan = ' | '.join(str(row[-1]) for row in rows)
+            used = [name for name in expected if name in plan]
+            all_ok = all_ok and bool(used)
+            print(f"{'✅' if used else '❌'} {description}: {plan}")
+    return all_ok
+
+def run():
+    parser = argparse.ArgumentParser(description='Create hot-query indexes')
+    parser.add_argument('--explain', action='store_true', help='only check query plans, do not create indexes')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    init_db(app)
+    engine = databases.engine
+    if not args.explain:
+        create_indexes(engine)
+        print('Index migration done.')
+    if not explain_hot_queries(engine):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    run()
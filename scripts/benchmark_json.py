@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: serializing an order listing (order + dishSnapshot + guest +
+orderHandler per row, like GET /orders) to a JSON response body.
+
+  legacy: hand-written to_dict() per model, image URL built with a new Config()
+          per row, stdlib json with Flask's defaults (sorted keys, ASCII escapes)
+  new:    generated ColumnSerializer to_dict(), memoized image_url(),
+          FastJSONProvider (orjson when installed, stdlib json otherwise)
+
+Run from project root: python scripts/benchmark_json.py
+Custom size / repeats: python scripts/benchmark_json.py --rows 10000 --repeat 5
+"""
+import sys
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from flask import Flask
+from config import Config
+from infrastructure.models import AccountModel, DishSnapshotModel, GuestModel, OrderModel
+from utils.json_provider import FastJSONProvider, json_backend
+
+def build_orders(count):
+    """Transient orders with their snapshot, guest and handler attached"""
+    now = datetime.utcnow()
+    handler = AccountModel(id=1, name='Nhân viên', email='staff@order.com', role='Employee', created_at=now, updated_at=now)
+    orders = []
+    for i in range(count):
+        created_at = now - timedelta(minutes=i)
+        snapshot = DishSnapshotModel(
+            id=i + 1, name=f'Phở bò {i % 50}', price=45000 + i % 7 * 5000, description='Phở bò tái chín, nước dùng hầm xương',
+            image=f'dish{i % 50}.jpg', status='Available', category='main', dish_id=i % 50 + 1,
+            created_at=created_at, updated_at=created_at
+        )
+        guest = GuestModel(id=i // 4 + 1, name=f'Khách {i // 4}', table_number=i % 20 + 1, created_at=created_at, updated_at=created_at)
+        order = OrderModel(
+            id=i + 1, guest_id=guest.id, table_number=guest.table_number, dish_snapshot_id=snapshot.id, quantity=i % 3 + 1,
+            note='Ít cay' if i % 5 == 0 else None, order_handler_id=1, status='Pending', created_at=created_at,
+            updated_at=created_at, version=i + 1
+        )
+        order.dish_snapshot = snapshot
+        order.guest = guest
+        order.order_handler_account = handler
+        orders.append(order)
+    return orders
+
+# --- legacy path (as it was before the generated serializers) ---
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+def legacy_format_image_url(image_path):
+    if not image_path:
+        return None
+    normalized_path = str(image_path).lstrip('/')
+    if normalized_path.startswith('static/'):
+        normalized_path = normalized_path[7:]
+    config = Config()
+    return f"{config.API_URL}/static/{normalized_path}"
+
+def legacy_serialize(order):
+    snapshot, guest, handler = order.dish_snapshot, order.guest, order.order_handler_account
+    return {
+        'id': order.id, 'guestId': order.guest_id, 'tableNumber': order.table_number,
+        'dishSnapshotId': order.dish_snapshot_id, 'quantity': order.quantity, 'note': order.note,
+        'orderHandlerId': order.order_handler_id, 'status': order.status,
+        'createdAt': _iso(order.created_at), 'updatedAt': _iso(order.updated_at), 'version': order.version,
+        'dishSnapshot': {
+            'id': snapshot.id, 'name': snapshot.name, 'price': snapshot.price, 'description': snapshot.description,
+            'image': legacy_format_image_url(snapshot.image), 'status': snapshot.status, 'category': snapshot.category,
+            'dishId': snapshot.dish_id, 'createdAt': _iso(snapshot.created_at), 'updatedAt': _iso(snapshot.updated_at)
+        },
+        'guest': {
+            'id': guest.id, 'name': guest.name, 'tableNumber': guest.table_number, 'role': 'Guest',
+            'createdAt': _iso(guest.created_at), 'updatedAt': _iso(guest.updated_at)
+        },
+        'orderHandler': {
+            'id': handler.id, 'name': handler.name, 'email': handler.email, 'avatar': handler.avatar, 'role': handler.role,
+            'createdAt': _iso(handler.created_at), 'updatedAt': _iso(handler.updated_at)
+        }
+    }
+
+def legacy_body(orders):
+    data = {'data': [legacy_serialize(order) for order in orders], 'message': 'Lấy danh sách đơn hàng thành công'}
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+# --- new path ---
+
+def new_serialize(order):
+    order_dict = order.to_dict()
+    order_dict['dishSnapshot'] = order.dish_snapshot.to_dict(resolve_image=True)
+    order_dict['guest'] = order.guest.to_dict()
+    order_dict['orderHandler'] = order.order_handler_account.to_dict()
+    return order_dict
+
+def timed(func, repeat):
+    """Best of `repeat` runs in milliseconds, plus the last result"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def run():
+    parser = argparse.ArgumentParser(description='Order listing serialization benchmark')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    app = Flask(__name__)
+    provider = FastJSONProvider(app)
+    orders = build_orders(args.rows)
+    
+    with app.app_context():
+        legacy_dict_ms, legacy_rows = timed(lambda: [legacy_serialize(order) for order in orders], args.repeat)
+        new_dict_ms, new_rows = timed(lambda: [new_serialize(order) for order in orders], args.repeat)
+        if legacy_rows != new_rows:
+            print('❌ The new serializers produce different rows than the legacy ones')
+            sys.exit(1)
+        
+        legacy_ms, legacy = timed(lambda: legacy_body(orders), args.repeat)
+        new_ms, new = timed(lambda: provider.response(
+            data=[new_serialize(order) for order in orders], message='Lấy danh sách đơn hàng thành công'
+        ).get_data(), args.repeat)
+        if json.loads(legacy) != json.loads(new):
+            print('❌ The response bodies differ')
+            sys.exit(1)
+    
+    print(f'{args.rows} orders, best of {args.repeat}, JSON backend: {json_backend()}')
+    print(f'{"":<22}{"legacy":>12}{"new":>12}{"speedup":>10}')
+    print(f'{"to_dict only (ms)":<22}{legacy_dict_ms:>12.1f}{new_dict_ms:>12.1f}{legacy_dict_ms / new_dict_ms:>9.1f}x')
+    print(f'{"full response (ms)":<22}{legacy_ms:>12.1f}{new_ms:>12.1f}{legacy_ms / new_ms:>9.1f}x')
+    print(f'{"body size (KB)":<22}{len(legacy) / 1024:>12.0f}{len(new) / 1024:>12.0f}')
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: password verification throughput under concurrent logins.
+Runs compare_password (bcrypt releases the GIL, so callers hash in parallel)
+from N concurrent callers and reports logins/second and p50/p95 latency for each concurrency level.
+
+Run from project root: python scripts/benchmark_login.py
+Custom cost / concurrency: python scripts/benchmark_login.py --rounds 10 12 --concurrency 1 8 32 --logins 64
+"""
+import sys
+import argparse
+import time
+import threading
+from pathlib import Path
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from config import Config
+from utils.crypto_utils import hash_password, compare_password
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_level(hashed, concurrency, logins):
+    """Verify `logins` passwords spread over `concurrency` caller threads"""
+    timings = []
+    lock = threading.Lock()
+    per_thread = max(logins // concurrency, 1)
+    
+    def worker():
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            assert compare_password('benchmark-password', hashed)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                timings.append(elapsed)
+    
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return {
+        'logins': len(timings),
+        'per_second': len(timings) / wall,
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent password verification')
+    parser.add_argument('--rounds', type=int, nargs='+', default=[Config.BCRYPT_ROUNDS])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--logins', type=int, default=64)
+    args = parser.parse_args()
+    
+    print(f"{'rounds':>6} {'callers':>8} {'logins':>7} {'logins/s':>9} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for rounds in args.rounds:
+        Config.BCRYPT_ROUNDS = rounds
+        hashed = hash_password('benchmark-password')
+        for concurrency in args.concurrency:
+            result = run_level(hashed, concurrency, args.logins)
+            print(f"{rounds:>6} {concurrency:>8} {result['logins']:>7} {result['per_second']:>9.1f} "
+                  f"{result['p50_ms']:>10.1f} {result['p95_ms']:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GET /orders listing (get_orders_service).
+Seeds a throw-away SQLite database with N orders and records, for each size,
+the number of SQL statements and the p50/p95 latency of one listing call.
+
+Run from project root: python scripts/benchmark_orders.py
+Custom sizes / repeats: python scripts/benchmark_orders.py --sizes 1000 10000 --repeat 5
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from flask import Flask
+from sqlalchemy import event
+import infrastructure.databases as databases
+from infrastructure.models import (
+    AccountModel, DishModel, DishSnapshotModel, TableModel, OrderModel, GuestModel
+)
+from services.order_service import get_orders_service
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+def seed(session, order_count):
+    """Insert one owner, 50 dishes, 20 tables, order_count/4 guests and order_count orders"""
+    now = datetime.utcnow()
+    session.add(AccountModel(id=1, name='Owner', email='bench@order.com', password='x', role='Owner'))
+    session.bulk_insert_mappings(TableModel, [
+        {'number': n, 'capacity': 4, 'status': 'Available', 'token': f'token-{n}'} for n in range(1, 21)
+    ])
+    session.bulk_insert_mappings(DishModel, [
+        {'id': i, 'name': f'Dish {i}', 'price': 10000 + i, 'description': 'benchmark',
+         'image': f'dish-{i}.jpg', 'status': 'Available', 'category': 'main'}
+        for i in range(1, 51)
+    ])
+    guest_count = max(order_count // 4, 1)
+    session.bulk_insert_mappings(GuestModel, [
+        {'id': i, 'name': f'Guest {i}', 'table_number': (i % 20) + 1} for i in range(1, guest_count + 1)
+    ])
+    session.bulk_insert_mappings(DishSnapshotModel, [
+        {'id': i, 'name': f'Dish {(i % 50) + 1}', 'price': 10000 + (i % 50) + 1, 'description': 'benchmark',
+         'image': f'dish-{(i % 50) + 1}.jpg', 'status': 'Available', 'category': 'main', 'dish_id': (i % 50) + 1}
+        for i in range(1, order_count + 1)
+    ])
+    session.bulk_insert_mappings(OrderModel, [
+        {'id': i, 'guest_id': (i % guest_count) + 1, 'table_number': (i % 20) + 1, 'dish_snapshot_id': i,
+         'quantity': 1 + i % 3, 'order_handler_id': 1 if i % 2 else None, 'status': 'Pending',
+         'created_at': now - timedelta(seconds=i), 'updated_at': now}
+        for i in range(1, order_count + 1)
+    ])
+    session.commit()
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_size(order_count, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        databases.init_db(app)
+
+        session = databases.get_session()
+        try:
+            seed(session, order_count)
+        finally:
+            session.close()
+
+        statements = []
+        @event.listens_for(databases.engine, 'before_cursor_execute')
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        timings = []
+        query_counts = []
+        for _ in range(repeat):
+            # One app context per call, like one request: fresh unit-of-work session each time
+            with app.app_context():
+                statements.clear()
+                started = time.perf_counter()
+                get_orders_service()
+                timings.append((time.perf_counter() - started) * 1000)
+                query_counts.append(len(statements))
+
+        databases.engine.dispose()
+        return {
+            'orders': order_count,
+            'queries': max(query_counts),
+            'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark get_orders_service')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'orders':>8} {'queries':>8} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for size in args.sizes:
+        result = run_size(size, args.repeat)
+        print(f"{result['orders']:>8} {result['queries']:>8} {result['p50_ms']:>10.1f} {result['p95_ms']:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Backfill: generate resized variants (thumb/card/full in IMAGE_VARIANT_FORMATS)
+for images uploaded before the variant pipeline existed. New uploads get them
+in the background automatically. Requires Pillow.
+
+Run from project root: python scripts/generate_image_variants.py
+Regenerate everything (e.g. after changing formats or quality): --force
+"""
+import sys
+import argparse
+import os
+from pathlib import Path
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from config import Config
+from utils.image_variants import VARIANT_WIDTHS, FORMAT_EXTENSIONS, MANIFEST_SUFFIX, generate_variants, load_manifest, variant_formats
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}
+
+def is_variant(name):
+    """Variant files are <stem>_<variant>.<ext>"""
+    stem, ext = os.path.splitext(name)
+    return ext.lstrip('.') in FORMAT_EXTENSIONS.values() and any(stem.endswith(f'_{variant}') for variant in VARIANT_WIDTHS)
+
+def run():
+    parser = argparse.ArgumentParser(description='Generate resized image variants for existing uploads')
+    parser.add_argument('--force', action='store_true', help='regenerate images that already have variants')
+    args = parser.parse_args()
+    
+    formats = variant_formats()
+    if not formats:
+        print('Pillow is not installed or none of IMAGE_VARIANT_FORMATS is supported, nothing to do.')
+        sys.exit(1)
+    print(f'Upload folder: {Config.UPLOAD_FOLDER}, formats: {", ".join(formats)}')
+    
+    generated = skipped = failed = 0
+    for name in sorted(os.listdir(Config.UPLOAD_FOLDER)):
+        if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS or name.endswith(MANIFEST_SUFFIX) or is_variant(name):
+            continue
+        if not args.force and load_manifest(name):
+            skipped += 1
+            continue
+        try:
+            manifest = generate_variants(name)
+            generated += 1
+            print(f"✅ {name}: {', '.join(str(item['width']) for item in manifest['variants'][formats[0]])}")
+        except Exception as e:
+            failed += 1
+            print(f'❌ {name}: {e}')
+    
+    print(f'Done: {generated} generated, {skipped} already had variants, {failed} failed.')
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Load test: manager-room broadcasts across several Socket.IO workers.
+Starts N workers sharing a message queue, each serving HTTP on its own port, and
+connects K Socket.IO manager clients (websocket, needs websocket-client) to each,
+then worker 0 broadcasts M events to the manager room. Every client on every
+worker must receive all M events.
+
+Run from project root (in-process message queue, workers are threads):
+    python scripts/load_test_socketio.py --workers 4 --managers 25 --broadcasts 200
+Against Redis (workers are separate processes):
+    python scripts/load_test_socketio.py --message-queue redis://localhost:6379/0 --workers 4
+"""
+import sys
+import argparse
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from flask import Flask
+from flask_socketio import SocketIO
+import socketio as socketio_client
+from werkzeug.serving import make_server
+from config import Config
+from domain.constants import Role, ManagerRoom
+from plugins.socket_plugin import setup_socket_handlers
+from plugins.socket_pubsub import socketio_queue_options
+from utils.jwt_utils import sign_access_token
+
+EVENT = 'load-test'
+
+def run_worker(index, url, port, managers, broadcasts, timeout, barrier, results):
+    """One worker: its own Socket.IO server on the shared queue, with `managers` clients"""
+    Config.SOCKETIO_MESSAGE_QUEUE = url
+    app = Flask(f'worker-{index}')
+    socketio = SocketIO(app, async_mode='threading', **socketio_queue_options())
+    setup_socket_handlers(socketio)
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    token = sign_access_token({'userId': index + 1, 'role': Role.Owner})
+    received = [0] * managers
+    lock = threading.Lock()
+    clients = []
+    for i in range(managers):
+        client = socketio_client.Client()
+        
+        def on_event(data, i=i):
+            with lock:
+                received[i] += 1
+        
+        client.on(EVENT, on_event)
+        client.connect(f'http://127.0.0.1:{port}', auth={'Authorization': f'Bearer {token}'}, transports=['websocket'])
+        clients.append(client)
+    # Let the queue listeners subscribe before anything is published
+    time.sleep(1)
+    barrier.wait()
+    
+    started = time.perf_counter()
+    if index == 0:
+        for seq in range(broadcasts):
+            socketio.emit(EVENT, {'seq': seq}, room=ManagerRoom)
+    
+    deadline = time.monotonic() + timeout
+    while min(received) < broadcasts and time.monotonic() < deadline:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    # Catch duplicates arriving after the last expected event
+    time.sleep(0.5)
+    
+    results.put({
+        'worker': index,
+        'clients': managers,
+        'min': min(received),
+        'max': max(received),
+        'seconds': elapsed
+    })
+    barrier.wait()
+    for client in clients:
+        client.disconnect()
+    server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description='Socket.IO manager-room fan-out across workers')
+    parser.add_argument('--message-queue', default='local://')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--managers', type=int, default=25, help='manager clients per worker')
+    parser.add_argument('--broadcasts', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--port', type=int, default=5100, help='first worker port, worker i listens on port + i')
+    args = parser.parse_args()
+    
+    if args.message_queue.startswith('local://'):
+        # The in-process queue only spans one process: run the workers as threads
+        barrier, results = threading.Barrier(args.workers), multiprocessing.Queue()
+        workers = [threading.Thread(target=run_worker, args=(i, args.message_queue, args.port + i, args.managers, args.broadcasts, args.timeout, barrier, results), daemon=True)
+                   for i in range(args.workers)]
+    else:
+        barrier, results = multiprocessing.Barrier(args.workers), multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=run_worker, args=(i, args.message_queue, args.port + i, args.managers, args.broadcasts, args.timeout, barrier, results), daemon=True)
+                   for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    rows = sorted((results.get() for _ in workers), key=lambda row: row['worker'])
+    for worker in workers:
+        worker.join()
+    
+    expected = args.broadcasts
+    print(f"queue: {args.message_queue}  broadcasts: {expected}  deliveries expected: {expected * args.managers * args.workers}")
+    print(f"{'worker':>6} {'clients':>8} {'min recv':>9} {'max recv':>9} {'seconds':>8} {'events/s':>9}")
+    for row in rows:
+        delivered = row['min'] * row['clients']
+        print(f"{row['worker']:>6} {row['clients']:>8} {row['min']:>9} {row['max']:>9} {row['seconds']:>8.2f} "
+              f"{delivered / row['seconds'] if row['seconds'] else 0:>9.0f}")
+    complete = all(row['min'] == expected and row['max'] == expected for row in rows)
+    print('✅ every client received every broadcast' if complete else '❌ missing or duplicated deliveries')
+    if not complete:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
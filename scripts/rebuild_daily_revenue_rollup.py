@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Rebuild the DailyDishRevenue and DailyGuestActivity rollup tables from scratch.
+The order services keep the rollup up to date incrementally; run this after
+importing orders directly into the database or if the rollup looks off.
+
+Run from project root: python scripts/rebuild_daily_revenue_rollup.py
+"""
+import sys
+from pathlib import Path
+
+# Allow running from project root or from scripts/
+project_root = Path(__file__).resolve().parent.parent
+src_path = project_root / 'src'
+sys.path.insert(0, str(src_path))
+
+from flask import Flask
+from config import Config
+from infrastructure.databases import init_db, get_session
+import infrastructure.models  # noqa: F401 - register all tables before create_all
+from services.indicator_service import rebuild_daily_revenue_rollup
+
+def run():
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    init_db(app)
+    
+    session = get_session()
+    try:
+        bucket_count = rebuild_daily_revenue_rollup(session)
+        session.commit()
+        print(f'✅ DailyDishRevenue rebuilt: {bucket_count} (day, dish) buckets, DailyGuestActivity rebuilt')
+    except Exception as e:
+        session.rollback()
+        print(f'❌ Error rebuilding DailyDishRevenue: {e}')
+        raise
+    finally:
+        session.close()
+
+if __name__ == '__main__':
+    run()
@@ -8,6 +8,7 @@ from config import Config
 from infrastructure.databases import init_db
 from infrastructure.admin_setup import setup_admin
 from utils.jwt_utils import verify_access_token
+from utils.json_provider import FastJSONProvider
 from domain.constants import Role
 import os
 
@@ -16,7 +17,7 @@ def create_admin_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     app.config['SECRET_KEY'] = Config.SECRET_KEY
-    app.config['JSON_AS_ASCII'] = False
+    app.json = FastJSONProvider(app)
     
     # CORS for admin panel
     CORS(app, resources={r"/*": {"origins": "*"}})
@@ -4,6 +4,7 @@ from utils.jwt_utils import verify_access_token
 from domain.exceptions import AuthError, ForbiddenError
 from domain.constants import Role
 from config import Config
+from utils.metrics import setup_metrics
 
 def require_logined(f):
     """Middleware to require login"""
@@ -18,13 +19,17 @@ def require_logined(f):
         if not auth_header:
             raise AuthError('Không nhận được access token')
         
-        try:
-            token = auth_header.split(' ')[1] if ' ' in auth_header else auth_header
-            decoded = verify_access_token(token)
+        token = auth_header.split(' ')[1] if ' ' in auth_header else auth_header
+        # Role decorators stack require_logined again: decode once per request
+        if g.get('access_token') != token:
+            try:
+                decoded = verify_access_token(token)
+            except ValueError as e:
+                raise AuthError('Access token không hợp lệ')
+            g.access_token = token
+            g.access_token_claims = decoded
             g.current_user_id = decoded.get('userId')
             g.current_user_role = decoded.get('role')
-        except ValueError as e:
-            raise AuthError('Access token không hợp lệ')
         
         return f(*args, **kwargs)
     return decorated_function
@@ -85,6 +90,9 @@ def pause_api_check(f):
 
 def setup_middleware(app):
     """Setup middleware for the app"""
+    # Per-route latency and SQL counters for /metrics, registered first so the timer starts first
+    setup_metrics(app)
+    
     @app.before_request
     def before_request():
         # Skip authentication for OPTIONS requests (CORS preflight)
@@ -1,14 +1,24 @@
 from flask import Blueprint, render_template_string, request, jsonify, g
 from api.middleware import require_owner
-from infrastructure.databases import get_session, engine
+from infrastructure.databases import get_session, get_db_pool_status, engine
 from infrastructure.databases.base import Base
 from infrastructure.models import (
     AccountModel, DishModel, DishSnapshotModel, TableModel, 
-    OrderModel, GuestModel, RefreshTokenModel, SocketModel
+    OrderModel, GuestModel, RefreshTokenModel, SocketModel, DailyDishRevenueModel, DailyGuestActivityModel, OrderVersionModel
 )
+from services.dish_service import invalidate_menu_cache, get_menu_cache_stats
+from services.table_service import invalidate_table_cache, get_table_cache_stats
+from services.media_service import get_static_stat_cache_stats
+from services.indicator_service import daily_revenue_keys, refresh_daily_revenue_rollup
+from services.order_service import next_order_version
+from utils.compression import get_compression_stats
+from utils.jwt_utils import get_access_token_cache_stats
+from utils.logging_utils import get_logger
 from sqlalchemy import inspect, text
 import json
 
+logger = get_logger(__name__)
+
 admin_bp = Blueprint('admin', __name__)
 
 # Map table names to models
@@ -21,6 +31,9 @@ TABLE_MODELS = {
     'Guest': GuestModel,
     'RefreshToken': RefreshTokenModel,
     'Socket': SocketModel,
+    'DailyDishRevenue': DailyDishRevenueModel,
+    'DailyGuestActivity': DailyGuestActivityModel,
+    'OrderVersion': OrderVersionModel,
 }
 
 def serialize_value(value):
@@ -320,6 +333,27 @@ def get_tables():
     finally:
         session.close()
 
+@admin_bp.route('/api/db-pool')
+@require_owner
+def get_db_pool():
+    """Database connection pool status (checked out, overflow, wait time, churn)"""
+    return jsonify({'data': get_db_pool_status(), 'message': 'Lấy trạng thái connection pool thành công'}), 200
+
+@admin_bp.route('/api/cache-stats')
+@require_owner
+def get_cache_stats():
+    """In-process cache counters (menu, table list, verified access tokens, static file stats, response compression)"""
+    return jsonify({
+        'data': {
+            'menu': get_menu_cache_stats(),
+            'tables': get_table_cache_stats(),
+            'accessToken': get_access_token_cache_stats(),
+            'staticFiles': get_static_stat_cache_stats(),
+            'compression': get_compression_stats()
+        },
+        'message': 'Lấy thống kê cache thành công'
+    }), 200
+
 @admin_bp.route('/table/<table_name>')
 def view_table(table_name):
     """View table data"""
@@ -901,11 +935,8 @@ def get_table_data(table_name):
         for record in records:
             try:
                 if hasattr(record, 'to_dict'):
-                    row_dict = record.to_dict()
-                    # Ensure all values are serializable
-                    for key, value in row_dict.items():
-                        row_dict[key] = serialize_value(value)
-                    data.append(row_dict)
+                    # to_dict output is already JSON-ready (see models.serializer)
+                    data.append(record.to_dict())
                 else:
                     # Fallback: use inspect to get all columns
                     row_dict = {}
@@ -929,9 +960,7 @@ def get_table_data(table_name):
                     data.append(row_dict)
                 except Exception as e2:
                     # Last resort: log error and skip this record
-                    import traceback
-                    print(f"Error serializing record: {e2}")
-                    traceback.print_exc()
+                    logger.exception('Error serializing %s record', table_name)
                     continue
         
         return jsonify({
@@ -979,6 +1008,9 @@ def update_table_record(table_name, pk_value):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
+        # Rollup buckets the order falls into before the edit (day or dish may change)
+        rollup_keys = daily_revenue_keys(session, [record.id]) if model is OrderModel else set()
+        
         # Update fields (skip primary key and read-only fields)
         mapper = inspect(model)
         pk_name = get_primary_key(model)
@@ -1003,14 +1035,20 @@ def update_table_record(table_name, pk_value):
                 except Exception as e:
                     return jsonify({'error': f'Error updating field {field_name}: {str(e)}'}), 400
         
+        if model is OrderModel:
+            # Let GET /orders/changes?since= clients pick up the edit
+            record.version = next_order_version(session)
+            refresh_daily_revenue_rollup(session, rollup_keys | daily_revenue_keys(session, [record.id]))
         session.commit()
+        if model is DishModel:
+            invalidate_menu_cache()
+        elif model is TableModel:
+            invalidate_table_cache()
         session.refresh(record)
         
         # Return updated record
         if hasattr(record, 'to_dict'):
             result = record.to_dict()
-            for key, value in result.items():
-                result[key] = serialize_value(value)
         else:
             mapper = inspect(model)
             result = {}
@@ -1043,8 +1081,14 @@ def delete_table_record(table_name, pk_value):
         if not record:
             return jsonify({'error': 'Record not found'}), 404
         
+        rollup_keys = daily_revenue_keys(session, [record.id]) if model is OrderModel else set()
         session.delete(record)
+        refresh_daily_revenue_rollup(session, rollup_keys)
         session.commit()
+        if model is DishModel:
+            invalidate_menu_cache()
+        elif model is TableModel:
+            invalidate_table_cache()
         
         return jsonify({'message': 'Record deleted successfully'}), 200
         
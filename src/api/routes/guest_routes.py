@@ -7,6 +7,7 @@ from services.guest_service import (
     guest_get_orders_service
 )
 from api.middleware import require_logined, require_guest
+from infrastructure.databases.query_diagnostics import query_budget
 
 guest_bp = Blueprint('guest', __name__, url_prefix='/guest')
 
@@ -30,6 +31,7 @@ def guest_create_orders():
     return guest_create_orders_service(request.json)
 
 @guest_bp.route('/orders', methods=['GET'])
+@query_budget(2)
 @require_logined
 @require_guest
 def guest_get_orders():
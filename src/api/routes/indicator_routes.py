@@ -1,10 +1,12 @@
 from flask import Blueprint, request
 from services.indicator_service import dashboard_indicator_service
 from api.middleware import require_logined, require_owner_or_employee
+from infrastructure.databases.query_diagnostics import query_budget
 
 indicator_bp = Blueprint('indicator', __name__, url_prefix='/indicators')
 
 @indicator_bp.route('/dashboard', methods=['GET'])
+@query_budget(8)
 @require_logined
 @require_owner_or_employee
 def dashboard_indicator():
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, current_app, jsonify
+from flask import Blueprint, request, jsonify
 from services.media_service import upload_image_service
 from api.middleware import require_logined, require_owner_or_employee, pause_api_check
 
@@ -21,11 +21,5 @@ def test_upload():
 @pause_api_check
 @require_owner_or_employee
 def upload_image():
-    # Log request details for debugging
-    current_app.logger.info(f"🔍 Media upload route hit - Method: {request.method}")
-    current_app.logger.info(f"🔍 Content-Type: {request.content_type}")
-    current_app.logger.info(f"🔍 Has files: {bool(request.files)}")
-    if request.files:
-        current_app.logger.info(f"🔍 File keys: {list(request.files.keys())}")
     return upload_image_service()
 
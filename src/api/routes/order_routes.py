@@ -2,11 +2,15 @@ from flask import Blueprint, request, g
 from services.order_service import (
     create_orders_service,
     get_orders_service,
+    get_orders_page_service,
+    stream_orders_service,
+    get_order_changes_service,
     get_order_detail_service,
     update_order_service,
     pay_orders_service
 )
 from api.middleware import require_logined, require_owner_or_employee
+from infrastructure.databases.query_diagnostics import query_budget
 
 order_bp = Blueprint('order', __name__, url_prefix='/orders')
 
@@ -17,13 +21,31 @@ def create_orders():
     return create_orders_service(request.json)
 
 @order_bp.route('/', methods=['GET'])
+@query_budget(3)
 @require_logined
 @require_owner_or_employee
 def get_orders():
     from_date = request.args.get('fromDate')
     to_date = request.args.get('toDate')
+    
+    # Opt-in modes: ?stream=true streams every row as chunked JSON,
+    # ?limit=/&cursor= returns one keyset page at a time
+    if request.args.get('stream', 'false').lower() == 'true':
+        return stream_orders_service(from_date, to_date)
+    if request.args.get('cursor') or request.args.get('limit'):
+        limit = request.args.get('limit', type=int)
+        return get_orders_page_service(from_date, to_date, request.args.get('cursor'), limit)
+    
     return get_orders_service(from_date, to_date)
 
+@order_bp.route('/changes', methods=['GET'])
+@require_logined
+@require_owner_or_employee
+def get_order_changes():
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    return get_order_changes_service(since, limit)
+
 @order_bp.route('/<int:order_id>', methods=['GET'])
 @require_logined
 @require_owner_or_employee
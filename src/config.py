@@ -13,6 +13,13 @@ class Config:
     
     # Database
     DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///dev.db'
+    # Connection pool (size it for workers x green threads; ignored for SQLite except recycle/pre-ping)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 300))  # Seconds, -1 disables
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ['true', '1']
+    DB_POOL_USE_LIFO = os.environ.get('DB_POOL_USE_LIFO', 'false').lower() in ['true', '1']
     
     # JWT
     ACCESS_TOKEN_SECRET = os.environ.get('ACCESS_TOKEN_SECRET', 'your-access-token-secret')
@@ -41,6 +48,70 @@ class Config:
     UPLOAD_FOLDER = os.path.join(_base_dir, _upload_folder) if not os.path.isabs(_upload_folder) else _upload_folder
     # Max file upload size (default 16MB, can be overridden via env)
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB default
+    # /static/<file>: stat results cached in memory (TTL in seconds, size 0 disables)
+    STATIC_STAT_CACHE_SIZE = int(os.environ.get('STATIC_STAT_CACHE_SIZE', 4096))
+    STATIC_STAT_CACHE_TTL = int(os.environ.get('STATIC_STAT_CACHE_TTL', 300))
+    # Let the proxy send file bodies: '' (app sends them), 'x-sendfile' or 'x-accel-redirect' (nginx)
+    STATIC_OFFLOAD = os.environ.get('STATIC_OFFLOAD', '').lower()
+    STATIC_ACCEL_REDIRECT_PREFIX = os.environ.get('STATIC_ACCEL_REDIRECT_PREFIX', '/protected-uploads')
+    USE_X_SENDFILE = STATIC_OFFLOAD == 'x-sendfile'
+    # Resized variants (thumb 160w, card 480w, full 1280w) generated after upload (needs Pillow)
+    IMAGE_VARIANTS_ENABLED = os.environ.get('IMAGE_VARIANTS_ENABLED', 'true').lower() in ['true', '1']
+    IMAGE_VARIANT_FORMATS = [f.strip().lower() for f in os.environ.get('IMAGE_VARIANT_FORMATS', 'webp,jpeg').split(',') if f.strip()]
+    IMAGE_VARIANT_QUALITY = int(os.environ.get('IMAGE_VARIANT_QUALITY', 80))
+    IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', 2))
+    
+    # Orders listing (GET /orders cursor and stream modes)
+    ORDER_PAGE_SIZE_DEFAULT = int(os.environ.get('ORDER_PAGE_SIZE_DEFAULT', 50))
+    ORDER_PAGE_SIZE_MAX = int(os.environ.get('ORDER_PAGE_SIZE_MAX', 200))
+    ORDER_STREAM_BATCH_SIZE = int(os.environ.get('ORDER_STREAM_BATCH_SIZE', 500))
+    # Send 'order-delta' events (changed fields + version) instead of full rows on update/payment
+    ORDER_DELTA_EVENTS = os.environ.get('ORDER_DELTA_EVENTS', 'false').lower() in ['true', '1']
+    
+    # Menu and table list cache (GET /dishes, /dishes/<id>, /tables), TTL in seconds, 0 disables the cache
+    MENU_CACHE_TTL = int(os.environ.get('MENU_CACHE_TTL', 60))
+    MENU_CACHE_MAX_ENTRIES = int(os.environ.get('MENU_CACHE_MAX_ENTRIES', 256))
+    
+    # Password hashing: bcrypt cost factor (4-31, +1 doubles the time)
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    
+    # Verified access tokens kept in memory until they expire, 0 disables the cache
+    ACCESS_TOKEN_CACHE_SIZE = int(os.environ.get('ACCESS_TOKEN_CACHE_SIZE', 1024))
+    
+    # Socket.IO across workers: message queue URL (redis://host:6379/0, local:// for tests), empty = single process
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE', '')
+    SOCKETIO_CHANNEL = os.environ.get('SOCKETIO_CHANNEL', 'flask-socketio')
+    # Comma separated, e.g. 'websocket' when the load balancer has no sticky sessions
+    SOCKETIO_TRANSPORTS = [t.strip() for t in os.environ.get('SOCKETIO_TRANSPORTS', '').split(',') if t.strip()]
+    
+    # Outbound socket events are coalesced per room for this window (ms), 0 emits synchronously
+    SOCKET_EMIT_WINDOW_MS = int(os.environ.get('SOCKET_EMIT_WINDOW_MS', 50))
+    # true: emit each event on its own (current clients); false: one 'batch' event per room and window
+    SOCKET_EMIT_SINGLE_EVENTS = os.environ.get('SOCKET_EMIT_SINGLE_EVENTS', 'true').lower() in ['true', '1']
+    
+    # Logging: level (empty = WARNING in production, INFO otherwise), 'text' or 'json',
+    # and the fraction of DEBUG/INFO records kept (warnings and errors are never sampled)
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', '')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+    
+    # Response compression (gzip, brotli when the package is installed) for JSON/text bodies
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ['true', '1']
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # bytes, smaller bodies are sent as is
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))  # gzip 1-9
+    BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 4))  # brotli 0-11
+    
+    # Prometheus /metrics: per-route latency and SQL counters, pool/cache/socket gauges (per process)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() in ['true', '1']
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')  # when set, scrapers send Authorization: Bearer <token> (required in PRODUCTION)
+    
+    # Development diagnostics: log slow statements (with parameters and call site), SELECTs repeated
+    # more than N_PLUS_ONE_THRESHOLD times in one request, and routes over their @query_budget
+    QUERY_DIAGNOSTICS = os.environ.get('QUERY_DIAGNOSTICS', 'false').lower() in ['true', '1']
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+    # true: answer 500 instead of only logging, so tests and smoke runs fail on a regression
+    QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'false').lower() in ['true', '1']
     
     # Client
     CLIENT_URL = os.environ.get('CLIENT_URL', 'http://localhost:3000')
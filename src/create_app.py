@@ -8,17 +8,29 @@ from error_handler import setup_error_handler
 from utils.helpers import create_folder
 from jobs.auto_remove_refresh_token import start_scheduler
 from plugins.socket_plugin import init_socketio, setup_socket_handlers
+from utils.logging_utils import setup_logging, get_logger
+from utils.json_provider import FastJSONProvider
+from utils.compression import setup_compression
+from services.metrics_service import metrics_service
 import os
 
+logger = get_logger(__name__)
+
 def create_app():
     app = Flask(__name__, static_folder=None, static_url_path=None)  # Disable Flask's default static folder and URL path
     app.config.from_object(Config)
     
+    # Leveled logging through a background queue, with a request id per request
+    setup_logging(app)
+    
+    # gzip/brotli for JSON responses, registered first so it runs after every other after_request hook
+    setup_compression(app)
+    
     # Set max content length for file uploads
     app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
     
-    # Ensure UTF-8 encoding for responses
-    app.config['JSON_AS_ASCII'] = False  # Allow non-ASCII characters in JSON
+    # Ensure UTF-8 encoding for responses: orjson (stdlib json fallback) writes non-ASCII as UTF-8
+    app.json = FastJSONProvider(app)
     
     # CORS - Configure with all necessary options (including file uploads)
     CORS(app, 
@@ -27,7 +39,7 @@ def create_app():
                  "origins": "*",
                  "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
                  "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-                 "expose_headers": ["Content-Type", "Authorization"],
+                 "expose_headers": ["Content-Type", "Authorization", "X-Request-ID"],
                  "supports_credentials": True,
                  "max_age": 3600
              }
@@ -45,6 +57,10 @@ def create_app():
                 response.headers['Content-Type'] = 'application/json; charset=utf-8'
             elif 'text/html' in content_type:
                 response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        # Conditional GET: answer If-None-Match with 304 for responses carrying an ETag
+        # (set by utils.http_cache.cached_json_response), the body is never sent
+        if request.method in ('GET', 'HEAD') and response.status_code == 200 and response.get_etag()[0]:
+            response.make_conditional(request)
         # Note: CORS headers are handled by flask_cors.CORS above, don't add them here to avoid duplicates
         return response
     
@@ -71,17 +87,24 @@ def create_app():
     def health_check():
         return {'status': 'ok', 'message': 'Server is running'}, 200
     
+    # Prometheus scrape endpoint, never served unauthenticated in production
+    if Config.METRICS_ENABLED and Config.PRODUCTION and not Config.METRICS_TOKEN:
+        logger.warning('METRICS_ENABLED is on but METRICS_TOKEN is empty: /metrics is not served in production')
+    elif Config.METRICS_ENABLED:
+        @app.route('/metrics', methods=['GET'])
+        def metrics():
+            return metrics_service()
+    
     # Register routes (static route is registered first in register_routes)
     register_routes(app)
     
     # Verify static route is registered correctly
-    print("📋 Registered routes:")
     for rule in app.url_map.iter_rules():
         if '/static' in rule.rule:
-            print(f"  - {rule.rule} -> {rule.endpoint}")
+            logger.debug('Static route: %s -> %s', rule.rule, rule.endpoint)
     
     # Start background jobs
-    start_scheduler()
+    start_scheduler(app)
     
     # Initialize owner account
     with app.app_context():
@@ -103,9 +126,45 @@ def create_app():
                 )
                 session.add(owner)
                 session.commit()
-                print(f"✅ Khởi tạo tài khoản chủ quán thành công: {Config.INITIAL_EMAIL_OWNER}|{Config.INITIAL_PASSWORD_OWNER}")
+                logger.warning('✅ Khởi tạo tài khoản chủ quán thành công: %s', Config.INITIAL_EMAIL_OWNER)
+        except Exception as e:
+            logger.error('Error initializing owner account: %s', e)
+            session.rollback()
+        finally:
+            session.close()
+    
+    # OrderVersion counter row, created once so concurrent order writes only ever UPDATE it
+    with app.app_context():
+        from infrastructure.databases import get_session
+        from services.order_service import ensure_order_version_counter
+        
+        session = get_session()
+        try:
+            ensure_order_version_counter(session)
+            session.commit()
+        except Exception as e:
+            logger.error('Error initializing order version counter: %s', e)
+            session.rollback()
+        finally:
+            session.close()
+    
+    # Backfill the daily rollups the first time they are deployed
+    with app.app_context():
+        from infrastructure.databases import get_session
+        from infrastructure.models.order_model import OrderModel
+        from infrastructure.models.daily_revenue_model import DailyDishRevenueModel, DailyGuestActivityModel
+        from services.indicator_service import rebuild_daily_revenue_rollup
+        
+        session = get_session()
+        try:
+            rollup_missing = session.query(DailyDishRevenueModel.id).first() is None \
+                or session.query(DailyGuestActivityModel.id).first() is None
+            if rollup_missing and session.query(OrderModel.id).first() is not None:
+                bucket_count = rebuild_daily_revenue_rollup(session)
+                session.commit()
+                logger.info('✅ Khởi tạo bảng DailyDishRevenue/DailyGuestActivity: %s dòng', bucket_count)
         except Exception as e:
-            print(f"Error initializing owner account: {e}")
+            logger.error('Error initializing daily revenue rollup: %s', e)
             session.rollback()
         finally:
             session.close()
@@ -2,8 +2,11 @@ from flask import jsonify
 from domain.exceptions import EntityError, AuthError, ForbiddenError, StatusError
 from sqlalchemy.exc import IntegrityError
 from werkzeug.exceptions import RequestEntityTooLarge
+from utils.logging_utils import get_logger
 import os
 
+logger = get_logger(__name__)
+
 def setup_error_handler(app):
     """Setup error handler for the app"""
     
@@ -65,13 +68,10 @@ def setup_error_handler(app):
     def handle_not_found(error):
         # Don't handle 404 for static files - let custom route handle them
         from flask import request
-        print(f"🔴 404 Error Handler: path={request.path}")
-        app.logger.info(f"🔴 404 Error Handler: path={request.path}")
+        logger.debug('404: %s', request.path)
         
         if request.path.startswith('/static/'):
             # Don't handle static file 404s - let the custom route handle it
-            print(f"🔴 Static file 404 - passing through to custom route")
-            app.logger.info(f"🔴 Static file 404 - passing through to custom route")
             # Return a proper 404 response for static files (custom route should handle it)
             from werkzeug.exceptions import NotFound
             # Let Flask's default 404 handling work, but return JSON for static files
@@ -1,14 +1,20 @@
 from sqlalchemy import create_engine
+from flask import has_app_context
 from sqlalchemy.orm import sessionmaker, scoped_session
 from infrastructure.databases.base import Base
+from infrastructure.databases.pool import InstrumentedQueuePool, attach_pool_listeners, get_pool_status
+from infrastructure.databases.query_stats import attach_query_listeners
+from infrastructure.databases.query_diagnostics import setup_query_diagnostics
+from infrastructure.databases.unit_of_work import UnitOfWorkSession, current_unit_of_work, setup_unit_of_work
 from config import Config
 
 engine = None
+SessionFactory = None
 SessionLocal = None
 
 def init_db(app):
     """Initialize database"""
-    global engine, SessionLocal
+    global engine, SessionFactory, SessionLocal
     
     database_uri = app.config['DATABASE_URI']
     
@@ -38,17 +44,34 @@ def init_db(app):
         separator = '&' if '?' in database_uri else '?'
         database_uri = f"{database_uri}{separator}connect_timeout=10"
     
+    pool_options = {
+        'pool_pre_ping': app.config.get('DB_POOL_PRE_PING', True),
+        'pool_recycle': app.config.get('DB_POOL_RECYCLE', 300)  # Recycle connections after 5 minutes
+    }
+    # SQLite keeps SQLAlchemy's default pool (sizing options don't apply to it)
+    if not database_uri.lower().startswith('sqlite'):
+        pool_options.update({
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': app.config.get('DB_POOL_SIZE', 5),
+            'max_overflow': app.config.get('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': app.config.get('DB_POOL_TIMEOUT', 30),
+            'pool_use_lifo': app.config.get('DB_POOL_USE_LIFO', False)
+        })
+    
     engine = create_engine(
         database_uri,
         echo=app.config.get('DEBUG', False),
-        pool_pre_ping=True,
-        pool_recycle=300,  # Recycle connections after 5 minutes
-        connect_args=connect_args
+        connect_args=connect_args,
+        **pool_options
     )
+    attach_pool_listeners(engine)
+    attach_query_listeners(engine)
+    setup_query_diagnostics(app, engine)
     
-    SessionLocal = scoped_session(
-        sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    )
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=UnitOfWorkSession)
+    # Thread-local session for code running outside an app context
+    SessionLocal = scoped_session(SessionFactory)
+    setup_unit_of_work(app)
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
@@ -56,6 +79,12 @@ def init_db(app):
     return SessionLocal
 
 def get_session():
-    """Get database session"""
+    """Get database session (shared by the whole request, socket event or job inside an app context)"""
+    if has_app_context():
+        return current_unit_of_work(SessionFactory)
     return SessionLocal()
 
+def get_db_pool_status():
+    """Connection pool occupancy and telemetry of the app engine"""
+    return get_pool_status(engine)
+
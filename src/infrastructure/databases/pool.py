@@ -0,0 +1,81 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+class PoolStats:
+    """Counters fed by pool events and InstrumentedQueuePool (thread-safe)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.invalidations = 0
+            self.wait_count = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+    
+    def record(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+    
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'connectionsCreated': self.connections_created,
+                'connectionsClosed': self.connections_closed,
+                'invalidations': self.invalidations,
+                'waitCount': self.wait_count,
+                'waitSecondsTotal': self.wait_seconds_total,
+                'waitSecondsAvg': self.wait_seconds_total / self.wait_count if self.wait_count else 0.0,
+                'waitSecondsMax': self.wait_seconds_max
+            }
+
+pool_stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record_wait(time.perf_counter() - started)
+
+def attach_pool_listeners(engine):
+    """Count checkouts and connection churn (connections opened/closed/invalidated)"""
+    event.listen(engine, 'checkout', lambda *args: pool_stats.record('checkouts'))
+    event.listen(engine, 'connect', lambda *args: pool_stats.record('connections_created'))
+    event.listen(engine, 'close', lambda *args: pool_stats.record('connections_closed'))
+    event.listen(engine, 'invalidate', lambda *args: pool_stats.record('invalidations'))
+
+def get_pool_status(engine):
+    """Current pool occupancy and cumulative counters of `engine`"""
+    pool = engine.pool
+    status = {
+        'poolClass': type(pool).__name__,
+        'status': pool.status()
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checkedIn': pool.checkedin(),
+            'checkedOut': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'timeout': pool.timeout()
+        })
+    status.update(pool_stats.snapshot())
+    return status
@@ -0,0 +1,105 @@
+import os
+import time
+import traceback
+from collections import Counter
+from flask import current_app, g, has_app_context, jsonify, request
+from sqlalchemy import event
+from config import Config
+from utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# src/, frames outside of it (SQLAlchemy, Flask, site-packages) are left out of call sites
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+_PARAMS_MAX_LENGTH = 500
+
+def query_budget(max_statements):
+    """Declare how many SQL statements a route may run (checked when QUERY_DIAGNOSTICS is on)
+        
+        @order_bp.route('/', methods=['GET'])
+        @query_budget(3)
+        @require_logined
+        def get_orders(): ...
+    """
+    def decorator(f):
+        f.query_budget = max_statements
+        return f
+    return decorator
+
+def call_site(limit=6):
+    """Innermost application frames of the current stack"""
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(_SRC_DIR) and frame.filename != __file__ and 'site-packages' not in frame.filename
+    ]
+    return ''.join(traceback.format_list(frames[-limit:]))
+
+def _format_params(parameters):
+    text = repr(parameters)
+    return text if len(text) <= _PARAMS_MAX_LENGTH else text[:_PARAMS_MAX_LENGTH] + '...'
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('diagnostics_started', []).append(time.perf_counter())
+    if not has_app_context() or g.get('query_diagnostics') is None:
+        return
+    g.query_diagnostics_total += 1
+    if statement.lstrip()[:6].upper() == 'SELECT':
+        statements = g.query_diagnostics
+        statements[statement] += 1
+        # Same SQL text means same statement with other bound values: remember where it came from once
+        if statements[statement] == Config.N_PLUS_ONE_THRESHOLD + 1:
+            g.query_diagnostics_sites[statement] = call_site()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info['diagnostics_started'].pop()) * 1000
+    if elapsed_ms >= Config.SLOW_QUERY_MS:
+        logger.warning('🐢 Slow query (%.1f ms): %s\nParams: %s\n%s', elapsed_ms, statement, _format_params(parameters), call_site())
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('diagnostics_started'):
+        connection.info['diagnostics_started'].pop()
+
+def _start_request():
+    g.query_diagnostics = Counter()
+    g.query_diagnostics_sites = {}
+    g.query_diagnostics_total = 0
+
+def _check_request(response):
+    """Log repeated SELECTs and exceeded budgets; QUERY_BUDGET_STRICT turns them into a 500"""
+    statements = g.pop('query_diagnostics', None)
+    if statements is None:
+        return response
+    sites = g.pop('query_diagnostics_sites')
+    total = g.pop('query_diagnostics_total')
+    route = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+    
+    problems = []
+    for statement, count in statements.items():
+        if count > Config.N_PLUS_ONE_THRESHOLD:
+            logger.warning('🔁 Possible N+1 in %s: the same SELECT ran %d times\n%s\n%s', route, count, statement, sites.get(statement, ''))
+            problems.append(f'same SELECT ran {count} times')
+    budget = getattr(current_app.view_functions.get(request.endpoint), 'query_budget', None)
+    if budget is not None and total > budget:
+        logger.warning('📊 %s ran %d SQL statements, budget is %d', route, total, budget)
+        problems.append(f'{total} SQL statements, budget is {budget}')
+    
+    if problems and Config.QUERY_BUDGET_STRICT:
+        response = jsonify({
+            'message': f"Query diagnostics failed for {route}: {'; '.join(problems)}",
+            'statusCode': 500
+        })
+        response.status_code = 500
+    return response
+
+def setup_query_diagnostics(app, engine):
+    """Opt-in (QUERY_DIAGNOSTICS): slow statement log, N+1 detector and per-route query budgets"""
+    if not Config.QUERY_DIAGNOSTICS:
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    app.before_request(_start_request)
+    app.after_request(_check_request)
+    logger.warning('Query diagnostics on: slow queries >= %s ms, N+1 above %s identical SELECTs per request%s',
+                   Config.SLOW_QUERY_MS, Config.N_PLUS_ONE_THRESHOLD, ', budgets enforced' if Config.QUERY_BUDGET_STRICT else '')
@@ -0,0 +1,24 @@
+import time
+from sqlalchemy import event
+from infrastructure.databases.base import Base
+from utils.metrics import record_statement, count_loaded_row
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_statement(time.perf_counter() - conn.info['query_started'].pop())
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_started'):
+        connection.info['query_started'].pop()
+
+def attach_query_listeners(engine):
+    """Time every SQL statement and count ORM rows loaded (see utils.metrics)"""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    if not event.contains(Base, 'load', count_loaded_row):
+        event.listen(Base, 'load', count_loaded_row, propagate=True)
@@ -0,0 +1,64 @@
+from functools import wraps
+from flask import g, current_app, has_app_context
+from sqlalchemy.orm import Session
+
+class UnitOfWorkSession(Session):
+    """Session shared by everything running in one request, socket event or job
+    
+    Services keep calling session.close() in their finally blocks; while the
+    session belongs to a unit of work that call is ignored and the session is
+    closed once by end_unit_of_work().
+    """
+    
+    def close(self):
+        if self.info.get('unit_of_work'):
+            return
+        super().close()
+    
+    def close_unit_of_work(self):
+        self.info.pop('unit_of_work', None)
+        super().close()
+
+def current_unit_of_work(session_factory):
+    """Session of the current app context, opened lazily on first use"""
+    session = g.get('db_session')
+    if session is None:
+        session = session_factory()
+        session.info['unit_of_work'] = True
+        g.db_session = session
+    return session
+
+def end_unit_of_work(exc=None):
+    """Commit the unit of work (or roll it back on error) and close its session"""
+    session = g.pop('db_session', None) if has_app_context() else None
+    if session is None:
+        return
+    try:
+        if exc is None and not g.pop('db_rollback', False):
+            session.commit()
+        else:
+            session.rollback()
+    except Exception as e:
+        session.rollback()
+        current_app.logger.error(f"❌ Failed to commit unit of work: {str(e)}")
+    finally:
+        session.close_unit_of_work()
+
+def setup_unit_of_work(app):
+    """Close the shared session at the end of every app context (request, socket event, job)"""
+    @app.after_request
+    def rollback_failed_request(response):
+        # Error responses (422, 404, ...) never commit what the service left pending
+        if response.status_code >= 400 and 'db_session' in g:
+            g.db_rollback = True
+        return response
+    
+    app.teardown_appcontext(end_unit_of_work)
+
+def run_in_unit_of_work(app, func):
+    """Wrap a background job so it runs in an app context with its own unit of work"""
+    @wraps(func)
+    def job(*args, **kwargs):
+        with app.app_context():
+            return func(*args, **kwargs)
+    return job
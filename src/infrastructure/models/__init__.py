@@ -5,6 +5,8 @@ from infrastructure.models.order_model import OrderModel
 from infrastructure.models.refresh_token_model import RefreshTokenModel
 from infrastructure.models.guest_model import GuestModel
 from infrastructure.models.socket_model import SocketModel
+from infrastructure.models.daily_revenue_model import DailyDishRevenueModel, DailyGuestActivityModel
+from infrastructure.models.order_version_model import OrderVersionModel
 
 __all__ = [
     'AccountModel',
@@ -14,6 +16,9 @@ __all__ = [
     'OrderModel',
     'RefreshTokenModel',
     'GuestModel',
-    'SocketModel'
+    'SocketModel',
+    'DailyDishRevenueModel',
+    'DailyGuestActivityModel',
+    'OrderVersionModel'
 ]
 
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from infrastructure.databases.base import Base, UnicodeString
 from datetime import datetime
+from infrastructure.models.serializer import ColumnSerializer
 
 class AccountModel(Base):
     __tablename__ = 'Account'
@@ -24,14 +25,5 @@ class AccountModel(Base):
     refresh_tokens = relationship('RefreshTokenModel', backref='account', lazy=True, cascade='all, delete-orphan')
     sockets = relationship('SocketModel', backref='account', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'avatar': self.avatar,
-            'role': self.role,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    to_dict = ColumnSerializer(exclude=('password', 'owner_id'))
 
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, Date, DateTime, Index, UniqueConstraint
+from infrastructure.databases.base import Base
+from datetime import datetime
+from infrastructure.models.serializer import ColumnSerializer
+
+class DailyDishRevenueModel(Base):
+    """Daily rollup of orders per dish (maintained by services.indicator_service)"""
+    __tablename__ = 'DailyDishRevenue'
+    __table_args__ = (
+        UniqueConstraint('day', 'dish_id', name='uq_daily_dish_revenue_day_dish'),
+        {'extend_existing': True}
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    dish_id = Column(Integer, nullable=True)  # NULL: snapshots whose dish was deleted
+    revenue = Column(Integer, nullable=False, default=0)  # Paid orders only (price x quantity)
+    order_count = Column(Integer, nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    to_dict = ColumnSerializer()
+
+class DailyGuestActivityModel(Base):
+    """Per day, guest and table: paid and still-served order counts (maintained by services.indicator_service)
+    
+    Distinct guests and serving tables can't be summed from DailyDishRevenue,
+    the dashboard counts distinct keys of this table instead of scanning Order.
+    Only (day, guest, table) combinations with a paid or served order are stored.
+    """
+    __tablename__ = 'DailyGuestActivity'
+    __table_args__ = (
+        UniqueConstraint('day', 'guest_id', 'table_number', name='uq_daily_guest_activity_day_guest_table'),
+        Index('ix_daily_guest_activity_day', 'day'),
+        {'extend_existing': True}
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    guest_id = Column(Integer, nullable=True)
+    table_number = Column(Integer, nullable=True)
+    paid_count = Column(Integer, nullable=False, default=0)
+    serving_count = Column(Integer, nullable=False, default=0)  # Pending, Processing or Delivered
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    to_dict = ColumnSerializer()
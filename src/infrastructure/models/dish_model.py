@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from infrastructure.databases.base import Base, UnicodeString
+from infrastructure.models.serializer import ColumnSerializer
+from utils.image_url import image_url
 from datetime import datetime
 
 class DishModel(Base):
     __tablename__ = 'Dish'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_dish_status', 'status'),
+        Index('ix_dish_category', 'category'),
+        Index('ix_dish_created_at', 'created_at'),  # menu ordering
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     # Use UnicodeString (NVARCHAR for MSSQL) to support Vietnamese characters
@@ -20,22 +27,21 @@ class DishModel(Base):
     
     dish_snapshots = relationship('DishSnapshotModel', backref='dish', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'price': self.price,
-            'description': self.description,
-            'image': self.image,
-            'status': self.status,
-            'category': self.category,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    _columns_to_dict = ColumnSerializer()
+    
+    def to_dict(self, resolve_image=False):
+        """resolve_image=True returns the public image URL instead of the stored path"""
+        data = self._columns_to_dict()
+        if resolve_image:
+            data['image'] = image_url(self.image)
+        return data
 
 class DishSnapshotModel(Base):
     __tablename__ = 'DishSnapshot'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_dish_snapshot_dish_id', 'dish_id'),  # delete_dish_service, revenue rollup
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     # Use UnicodeString (NVARCHAR for MSSQL) to support Vietnamese characters
@@ -51,17 +57,12 @@ class DishSnapshotModel(Base):
     
     order = relationship('OrderModel', backref='dish_snapshot', uselist=False, lazy=True)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'price': self.price,
-            'description': self.description,
-            'image': self.image,
-            'status': self.status,
-            'category': self.category,
-            'dishId': self.dish_id,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    _columns_to_dict = ColumnSerializer()
+    
+    def to_dict(self, resolve_image=False):
+        """resolve_image=True returns the public image URL instead of the stored path"""
+        data = self._columns_to_dict()
+        if resolve_image:
+            data['image'] = image_url(self.image)
+        return data
 
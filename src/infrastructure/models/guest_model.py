@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from infrastructure.databases.base import Base, UnicodeString
 from datetime import datetime
+from infrastructure.models.serializer import ColumnSerializer
 
 class GuestModel(Base):
     __tablename__ = 'Guest'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_guest_created_at', 'created_at'),
+        Index('ix_guest_table_number', 'table_number'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     # Use UnicodeString (NVARCHAR for MSSQL) to support Vietnamese characters
@@ -19,13 +24,5 @@ class GuestModel(Base):
     orders = relationship('OrderModel', backref='guest', lazy=True)
     sockets = relationship('SocketModel', backref='guest', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'tableNumber': self.table_number,
-            'role': 'Guest',
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    to_dict = ColumnSerializer(exclude=('refresh_token', 'refresh_token_expires_at'), constants={'role': 'Guest'})
 
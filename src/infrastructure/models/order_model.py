@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from infrastructure.databases.base import Base, UnicodeString
 from datetime import datetime
+from infrastructure.models.serializer import ColumnSerializer
 
 class OrderModel(Base):
     __tablename__ = 'Order'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_order_created_at', 'created_at'),  # date-window listings, indicators
+        Index('ix_order_status_created_at', 'status', 'created_at'),  # status filtered listings
+        Index('ix_order_guest_id_status', 'guest_id', 'status'),  # pay_orders_service, guest orders
+        Index('ix_order_table_number', 'table_number'),
+        Index('ix_order_version', 'version'),  # GET /orders/changes
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     guest_id = Column(Integer, ForeignKey('Guest.id'), nullable=True)
@@ -16,18 +24,8 @@ class OrderModel(Base):
     status = Column(String(50), default='Pending')
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped on every change from the OrderVersion counter: increases per order and across orders
+    version = Column(Integer, nullable=False, default=0, server_default='0')
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'guestId': self.guest_id,
-            'tableNumber': self.table_number,
-            'dishSnapshotId': self.dish_snapshot_id,
-            'quantity': self.quantity,
-            'note': self.note,
-            'orderHandlerId': self.order_handler_id,
-            'status': self.status,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    to_dict = ColumnSerializer()
 
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer
+from infrastructure.databases.base import Base
+from infrastructure.models.serializer import ColumnSerializer
+
+class OrderVersionModel(Base):
+    """Single-row counter handing out Order.version values (see services.order_service)"""
+    __tablename__ = 'OrderVersion'
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    
+    to_dict = ColumnSerializer()
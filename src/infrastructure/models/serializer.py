@@ -0,0 +1,53 @@
+from sqlalchemy import Date, DateTime, inspect
+
+def camel_case(name):
+    """created_at -> createdAt"""
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+class ColumnSerializer:
+    """`to_dict` generated from the mapped columns of a model
+    
+    The function body is compiled once per model, on first use: one dict literal
+    with camelCase keys, datetimes through isoformat(), no per-row reflection.
+        
+        class GuestModel(Base):
+            ...
+            to_dict = ColumnSerializer(exclude=('refresh_token',), constants={'role': 'Guest'})
+    """
+    
+    def __init__(self, exclude=(), constants=None):
+        self.exclude = set(exclude)
+        self.constants = dict(constants or {})
+        self.name = 'to_dict'
+        self._func = None
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def _compile(self, model):
+        temporal = []
+        items = []
+        for attr in inspect(model).column_attrs:
+            if attr.key in self.exclude:
+                continue
+            if isinstance(attr.columns[0].type, (DateTime, Date)):
+                temporal.append(attr.key)
+                items.append(f"{camel_case(attr.key)!r}: {attr.key}.isoformat() if {attr.key} is not None else None")
+            else:
+                items.append(f"{camel_case(attr.key)!r}: self.{attr.key}")
+        items.extend(f"{key!r}: {value!r}" for key, value in self.constants.items())
+        
+        lines = [f"def {self.name}(self):"]
+        lines.extend(f"    {key} = self.{key}" for key in temporal)
+        lines.append("    return {" + ", ".join(items) + "}")
+        namespace = {}
+        exec(compile('\n'.join(lines), f'<{model.__name__}.{self.name}>', 'exec'), namespace)
+        return namespace[self.name]
+    
+    def __get__(self, obj, objtype=None):
+        if self._func is None:
+            self._func = self._compile(objtype)
+        if obj is None:
+            return self._func
+        return self._func.__get__(obj, objtype)
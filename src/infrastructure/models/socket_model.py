@@ -1,5 +1,6 @@
 from sqlalchemy import Column, String, Integer, ForeignKey
 from infrastructure.databases.base import Base
+from infrastructure.models.serializer import ColumnSerializer
 
 class SocketModel(Base):
     __tablename__ = 'Socket'
@@ -9,10 +10,5 @@ class SocketModel(Base):
     account_id = Column(Integer, ForeignKey('Account.id'), unique=True, nullable=True)
     guest_id = Column(Integer, ForeignKey('Guest.id'), unique=True, nullable=True)
     
-    def to_dict(self):
-        return {
-            'socketId': self.socket_id,
-            'accountId': self.account_id,
-            'guestId': self.guest_id
-        }
+    to_dict = ColumnSerializer()
 
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.orm import relationship
 from infrastructure.databases.base import Base
 from datetime import datetime
+from infrastructure.models.serializer import ColumnSerializer
 
 class TableModel(Base):
     __tablename__ = 'Table'
@@ -17,13 +18,5 @@ class TableModel(Base):
     orders = relationship('OrderModel', backref='table', lazy=True)
     guests = relationship('GuestModel', backref='table', lazy=True)
     
-    def to_dict(self):
-        return {
-            'number': self.number,
-            'capacity': self.capacity,
-            'status': self.status,
-            'token': self.token,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
-        }
+    to_dict = ColumnSerializer()
 
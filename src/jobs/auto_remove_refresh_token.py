@@ -1,8 +1,12 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from infrastructure.databases import get_session
+from infrastructure.databases.unit_of_work import run_in_unit_of_work
 from infrastructure.models.refresh_token_model import RefreshTokenModel
+from utils.logging_utils import get_logger
 from datetime import datetime
 
+logger = get_logger(__name__)
+
 def auto_remove_refresh_token_job():
     """Auto remove expired refresh tokens"""
     session = get_session()
@@ -12,16 +16,16 @@ def auto_remove_refresh_token_job():
         ).delete()
         session.commit()
     except Exception as e:
-        print(f"Error removing expired refresh tokens: {e}")
+        logger.error('Error removing expired refresh tokens: %s', e)
         session.rollback()
     finally:
         session.close()
 
-def start_scheduler():
-    """Start the scheduler"""
+def start_scheduler(app):
+    """Start the scheduler (each job run gets its own app context and unit of work)"""
     scheduler = BackgroundScheduler()
     scheduler.add_job(
-        auto_remove_refresh_token_job,
+        run_in_unit_of_work(app, auto_remove_refresh_token_job),
         'interval',
         hours=1,
         id='auto_remove_refresh_token',
@@ -1,25 +1,35 @@
 from flask_socketio import SocketIO, emit, join_room, disconnect
 from flask import request
-from infrastructure.databases import get_session
-from infrastructure.models.socket_model import SocketModel
-from infrastructure.models.account_model import AccountModel
-from infrastructure.models.guest_model import GuestModel
 from utils.jwt_utils import verify_access_token
 from domain.exceptions import AuthError
 from domain.constants import Role, ManagerRoom
+from plugins.socket_pubsub import socketio_queue_options
+from utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 socketio = None
 
+def guest_room(guest_id):
+    """Room joined by every socket of a guest"""
+    return f'guest:{guest_id}'
+
+def account_room(account_id):
+    """Room joined by every socket of an owner/employee account"""
+    return f'account:{account_id}'
+
 def init_socketio(app):
-    """Initialize Socket.IO"""
+    """Initialize Socket.IO (emits are shared across workers when a message queue is configured)"""
     global socketio
+    queue_options = socketio_queue_options()
     try:
         socketio = SocketIO(
             app,
             cors_allowed_origins="*",
             async_mode='eventlet',
-            logger=True,
-            engineio_logger=True
+            logger=get_logger('socketio'),
+            engineio_logger=get_logger('engineio'),
+            **queue_options
         )
     except:
         # Fallback to threading mode if eventlet not available
@@ -27,8 +37,9 @@ def init_socketio(app):
             app,
             cors_allowed_origins="*",
             async_mode='threading',
-            logger=True,
-            engineio_logger=True
+            logger=get_logger('socketio'),
+            engineio_logger=get_logger('engineio'),
+            **queue_options
         )
     return socketio
 
@@ -42,7 +53,7 @@ def setup_socket_handlers(socketio):
             authorization = auth.get('Authorization') if auth else None
             
             if not authorization:
-                print('❌ Socket connection: No authorization')
+                logger.info('Socket connection rejected: no authorization')
                 return False
             
             token = authorization.split(' ')[1] if ' ' in authorization else authorization
@@ -50,50 +61,25 @@ def setup_socket_handlers(socketio):
             user_id = decoded_access_token.get('userId')
             role = decoded_access_token.get('role')
             
-            session = get_session()
-            try:
-                if role == Role.Guest:
-                    # Upsert socket for guest
-                    socket_record = session.query(SocketModel).filter_by(guest_id=user_id).first()
-                    if socket_record:
-                        socket_record.socket_id = request.sid
-                    else:
-                        socket_record = SocketModel(
-                            guest_id=user_id,
-                            socket_id=request.sid
-                        )
-                        session.add(socket_record)
-                else:
-                    # Upsert socket for account
-                    socket_record = session.query(SocketModel).filter_by(account_id=user_id).first()
-                    if socket_record:
-                        socket_record.socket_id = request.sid
-                    else:
-                        socket_record = SocketModel(
-                            account_id=user_id,
-                            socket_id=request.sid
-                        )
-                        session.add(socket_record)
-                    # Join manager room
-                    join_room(ManagerRoom)
-                
-                session.commit()
-                print(f'🔌 Socket connected: {request.sid} (User: {user_id}, Role: {role})')
-                return True
-            except Exception as e:
-                session.rollback()
-                print(f'❌ Socket connection error: {str(e)}')
-                return False
-            finally:
-                session.close()
+            # Every socket of a user (one per tab/device) joins the user's room, so
+            # emits need no lookup and Socket.IO drops the membership on disconnect
+            if role == Role.Guest:
+                join_room(guest_room(user_id))
+            else:
+                join_room(account_room(user_id))
+                # Join manager room
+                join_room(ManagerRoom)
+            
+            logger.debug('Socket connected: %s (user %s, role %s)', request.sid, user_id, role)
+            return True
         except Exception as e:
-            print(f'❌ Socket connection error: {str(e)}')
+            logger.info('Socket connection rejected: %s', e)
             return False
     
     @socketio.on('disconnect')
     def handle_disconnect():
-        """Handle socket disconnection"""
-        print(f'🔌 Socket disconnected: {request.sid}')
+        """Handle socket disconnection (Socket.IO removes the socket from its rooms)"""
+        logger.debug('Socket disconnected: %s', request.sid)
 
 def get_socketio():
     """Get Socket.IO instance"""
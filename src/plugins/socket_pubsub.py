@@ -0,0 +1,48 @@
+import queue
+import threading
+from socketio import PubSubManager
+from config import Config
+
+class LocalPubSubManager(PubSubManager):
+    """In-process stand-in for the Redis message queue (SOCKETIO_MESSAGE_QUEUE=local://)
+    
+    Every SocketIO server created in this process with the same channel shares
+    emits and room changes, like separate workers sharing Redis. Meant for tests
+    and the load test; it blocks on a plain queue, so use the threading async mode.
+    """
+    name = 'local'
+    _subscribers = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, url='local://', channel='flask-socketio', write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self._inbox = queue.Queue()
+    
+    def _publish(self, data):
+        message = self.json.dumps(data)
+        with self._lock:
+            inboxes = list(self._subscribers.get(self.channel, []))
+        for inbox in inboxes:
+            inbox.put(message)
+    
+    def _listen(self):
+        with self._lock:
+            self._subscribers.setdefault(self.channel, []).append(self._inbox)
+        while True:
+            yield self._inbox.get()
+
+def socketio_queue_options():
+    """SocketIO kwargs for the configured cross-worker message queue and transports"""
+    options = {}
+    url = Config.SOCKETIO_MESSAGE_QUEUE
+    if url.startswith('local://'):
+        options['client_manager'] = LocalPubSubManager(url, channel=Config.SOCKETIO_CHANNEL)
+    elif url:
+        # redis://, rediss://, kafka://, zmq+tcp:// or any kombu URL (amqp://, ...)
+        options['message_queue'] = url
+        options['channel'] = Config.SOCKETIO_CHANNEL
+    if Config.SOCKETIO_TRANSPORTS:
+        # ['websocket'] lets several workers run behind a load balancer without sticky
+        # sessions (long-polling requests of one client must reach the same worker)
+        options['transports'] = Config.SOCKETIO_TRANSPORTS
+    return options
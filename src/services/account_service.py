@@ -1,7 +1,6 @@
 from flask import jsonify, g
 from infrastructure.databases import get_session
 from infrastructure.models.account_model import AccountModel
-from infrastructure.models.socket_model import SocketModel
 from infrastructure.models.refresh_token_model import RefreshTokenModel
 from utils.crypto_utils import hash_password, compare_password
 from utils.jwt_utils import sign_access_token, sign_refresh_token, verify_refresh_token
@@ -9,7 +8,7 @@ from domain.exceptions import EntityError
 from domain.constants import Role
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
-from utils.socket_utils import emit_to_socket
+from utils.socket_utils import emit_to_socket, account_room
 
 def get_account_list_service():
     """Get all accounts"""
@@ -76,7 +75,6 @@ def update_employee_account_service(account_id, body):
     """Update employee account"""
     session = get_session()
     try:
-        socket_record = session.query(SocketModel).filter_by(account_id=account_id).first()
         old_account = session.query(AccountModel).get(account_id)
         
         if not old_account:
@@ -99,8 +97,8 @@ def update_employee_account_service(account_id, body):
         session.refresh(old_account)
         
         # Emit socket event if role changed
-        if is_change_role and socket_record:
-            emit_to_socket(socket_record.socket_id, 'refresh-token', old_account.to_dict())
+        if is_change_role:
+            emit_to_socket(account_room(account_id), 'refresh-token', old_account.to_dict())
         
         response = jsonify({
             'data': old_account.to_dict(),
@@ -119,7 +117,6 @@ def delete_employee_account_service(account_id):
     from flask import abort
     session = get_session()
     try:
-        socket_record = session.query(SocketModel).filter_by(account_id=account_id).first()
         account = session.query(AccountModel).get(account_id)
         if not account:
             abort(404)
@@ -128,8 +125,7 @@ def delete_employee_account_service(account_id):
         session.commit()
         
         # Emit socket event
-        if socket_record:
-            emit_to_socket(socket_record.socket_id, 'logout', account_dict)
+        emit_to_socket(account_room(account_id), 'logout', account_dict)
         
         response = jsonify({
             'data': account_dict,
@@ -2,7 +2,7 @@ from flask import jsonify, redirect
 from infrastructure.databases import get_session
 from infrastructure.models.account_model import AccountModel
 from infrastructure.models.refresh_token_model import RefreshTokenModel
-from utils.crypto_utils import compare_password
+from utils.crypto_utils import compare_password, hash_password, password_needs_rehash
 from utils.jwt_utils import sign_access_token, sign_refresh_token, verify_refresh_token
 from domain.exceptions import EntityError, AuthError, StatusError
 from domain.constants import Role
@@ -25,6 +25,10 @@ def login_service(body):
         if not compare_password(password, account.password):
             raise EntityError([{'field': 'password', 'message': 'Email hoặc mật khẩu không đúng'}])
         
+        # Upgrade hashes made with an older cost factor while we have the plain password
+        if password_needs_rehash(account.password):
+            account.password = hash_password(password)
+        
         access_token = sign_access_token({
             'userId': account.id,
             'role': account.role
@@ -1,64 +1,61 @@
-from flask import jsonify, current_app
+from collections import Counter
+from flask import jsonify
 from infrastructure.databases import get_session
 from infrastructure.models.dish_model import DishModel
+from domain.constants import DishStatus
+from sqlalchemy import func
 from config import Config
 from utils.socket_utils import emit_to_manager
+from services.indicator_service import daily_revenue_keys, refresh_daily_revenue_rollup
+from utils.cache_utils import VersionedCache
+from utils.http_cache import cached_json_response
+from utils.logging_utils import get_logger
+from utils.image_variants import image_srcset
+from utils.image_url import normalize_image_path, STATIC_BASE_URL
 
-def _normalize_image_path(image_path):
-    """Normalize image path to store in database (extract filename from URL if needed)"""
-    if not image_path:
-        return ''
-    
-    # If it's a full URL, extract the filename
-    if image_path.startswith('http://') or image_path.startswith('https://'):
-        # Extract filename from URL like: http://localhost:4000/static/filename.jpg
-        if '/static/' in image_path:
-            return image_path.split('/static/')[-1]
-        # If URL doesn't have /static/, try to extract last part
-        return image_path.split('/')[-1]
-    
-    # Remove leading slash and 'static/' if exists
-    normalized = image_path.lstrip('/')
-    if normalized.startswith('static/'):
-        normalized = normalized[7:]
-    
-    return normalized
+logger = get_logger(__name__)
 
-def _format_image_url(image_path):
-    """Format image URL to full URL if needed"""
-    # Handle None, empty string, or whitespace-only strings
-    if not image_path or (isinstance(image_path, str) and not image_path.strip()):
-        print(f"⚠️  Empty or None image path, returning None")
-        return None
-    
-    # Convert to string and strip whitespace
-    image_path = str(image_path).strip()
-    
-    # If already a full URL, normalize it first (extract filename)
-    if image_path.startswith('http://') or image_path.startswith('https://'):
-        # Extract filename from URL (normalize production URLs to filename)
-        if '/static/' in image_path:
-            normalized_path = image_path.split('/static/')[-1]
-        else:
-            # Try to extract last part of URL
-            normalized_path = image_path.split('/')[-1]
-    else:
-        # Normalize path (remove leading slash and static/ prefix if exists)
-        normalized_path = image_path.lstrip('/')
-        if normalized_path.startswith('static/'):
-            normalized_path = normalized_path[7:]
+# Serialized GET /dishes and GET /dishes/<id> responses
+menu_cache = VersionedCache(ttl_seconds=Config.MENU_CACHE_TTL, max_entries=Config.MENU_CACHE_MAX_ENTRIES)
+
+def invalidate_menu_cache():
+    """Drop cached menus after a dish is created, updated or deleted"""
+    menu_cache.invalidate()
+
+def get_menu_cache_stats():
+    """Hit/miss counters of the menu cache"""
+    return menu_cache.stats()
+
+def _status_counts(histogram):
+    """{status: count} -> dict with 'total', 'available', 'unavailable' and 'hidden' counts"""
+    return {
+        'total': sum(histogram.values()),
+        'available': histogram.get(DishStatus.Available, 0),
+        'unavailable': histogram.get(DishStatus.Unavailable, 0),
+        'hidden': histogram.get(DishStatus.Hidden, 0)
+    }
+
+def get_dish_status_counts(session):
+    """Dish count per status in one GROUP BY query, cached with the menu version
     
-    # If path is empty after normalization, return None
-    if not normalized_path or not normalized_path.strip():
-        print(f"⚠️  Image path became empty after normalization: '{image_path}' -> '{normalized_path}'")
-        return None
+    Returns:
+        dict with 'total', 'available', 'unavailable' and 'hidden' counts
+    """
+    status_counts = menu_cache.get(('status_counts',))
+    if status_counts is not None:
+        return status_counts
+    cache_version = menu_cache.version
     
-    # Get API URL from config instance
-    config = Config()
-    api_url = config.API_URL  # Access property correctly
-    result_url = f"{api_url}/static/{normalized_path}"
-    print(f"🔗 Formatting image: '{image_path}' -> '{result_url}'")
-    return result_url
+    histogram = dict(session.query(DishModel.status, func.count(DishModel.id)).group_by(DishModel.status).all())
+    status_counts = _status_counts(histogram)
+    menu_cache.set(('status_counts',), status_counts, version=cache_version)
+    return status_counts
+
+def _serialize_dish(dish):
+    """Dish with its image URL and the srcset of its resized variants"""
+    dish_dict = dish.to_dict(resolve_image=True)
+    dish_dict['imageSrcset'] = image_srcset(normalize_image_path(dish.image), STATIC_BASE_URL) if dish_dict['image'] else None
+    return dish_dict
 
 def get_dish_list_service(show_all=False, include_unavailable=False, category=None, search=None):
     """Get all dishes (for public homepage)
@@ -69,32 +66,39 @@ def get_dish_list_service(show_all=False, include_unavailable=False, category=No
         category: Optional filter by category (main, side, drink)
         search: Optional search by name and description (case-insensitive, strip)
     """
+    cache_key = ('list', show_all, include_unavailable, category, search.strip() if search and search.strip() else None)
+    return cached_json_response(
+        menu_cache,
+        cache_key,
+        lambda: _build_dish_list_response(show_all, include_unavailable, category, search)
+    )
+
+def _build_dish_list_response(show_all, include_unavailable, category, search):
+    """Query and serialize the dish list (cache miss path of get_dish_list_service)"""
     session = get_session()
+    cache_version = menu_cache.version
     try:
-        query = session.query(DishModel)
+        # One statement for the list and the stats: the menu is small, the status
+        # histogram and the category/status filters are computed from the same rows
+        all_dishes = session.query(DishModel).order_by(DishModel.created_at.desc()).all()
+        status_counts = _status_counts(Counter(dish.status for dish in all_dishes))
+        menu_cache.set(('status_counts',), status_counts, version=cache_version)
         
         # Filter by category if provided
+        dishes = all_dishes
         if category and category in ('main', 'side', 'drink'):
-            query = query.filter(DishModel.category == category)
+            dishes = [d for d in dishes if d.category == category]
         
         # If show_all is True, return all dishes (with filters above)
         if show_all:
-            dishes = query.order_by(DishModel.created_at.desc()).all()
+            dishes = list(dishes)
         elif include_unavailable:
             # Show Available and Unavailable, but exclude Hidden
-            query = query.filter(DishModel.status.in_(['Available', 'Unavailable']))
-            dishes = query.order_by(DishModel.created_at.desc()).all()
+            dishes = [d for d in dishes if d.status in (DishStatus.Available, DishStatus.Unavailable)]
         else:
             # Default: Get all dishes, but prioritize Available ones
-            # If no Available dishes, show all dishes
-            available_query = query.filter(DishModel.status == 'Available')
-            available_dishes = available_query.order_by(DishModel.created_at.desc()).all()
-            
-            # If no available dishes, get all dishes (with same category/search filters)
-            if not available_dishes:
-                dishes = query.order_by(DishModel.created_at.desc()).all()
-            else:
-                dishes = available_dishes
+            # If no Available dishes, show all dishes (with same category/search filters)
+            dishes = [d for d in dishes if d.status == DishStatus.Available] or dishes
         
         # Client-side search filter (by name and description) if search provided
         if search and search.strip():
@@ -107,18 +111,13 @@ def get_dish_list_service(show_all=False, include_unavailable=False, category=No
         # Format dishes with full image URLs
         dishes_data = []
         for dish in dishes:
-            dish_dict = dish.to_dict()
-            original_image = dish_dict.get('image')
-            formatted_image = _format_image_url(original_image)
-            dish_dict['image'] = formatted_image
-            print(f"📸 Dish ID {dish.id} ({dish.name}): original='{original_image}' -> formatted='{formatted_image}'")
-            dishes_data.append(dish_dict)
-        
-        # Get status counts for frontend info
-        total_count = session.query(DishModel).count()
-        available_count = session.query(DishModel).filter(DishModel.status == 'Available').count()
-        unavailable_count = session.query(DishModel).filter(DishModel.status == 'Unavailable').count()
-        hidden_count = session.query(DishModel).filter(DishModel.status == 'Hidden').count()
+            dishes_data.append(_serialize_dish(dish))
+        
+        # Status counts for frontend info
+        total_count = status_counts['total']
+        available_count = status_counts['available']
+        unavailable_count = status_counts['unavailable']
+        hidden_count = status_counts['hidden']
         
         response = jsonify({
             'data': dishes_data,
@@ -150,34 +149,22 @@ def get_dish_list_with_pagination_service(page, limit):
         # Get all dishes (for manage page, not filtered by status - includes Unavailable and Hidden)
         dishes = session.query(DishModel).order_by(DishModel.created_at.desc()).offset(offset).limit(limit).all()
         
-        total_item = session.query(DishModel).count()
+        status_counts = get_dish_status_counts(session)
+        total_item = status_counts['total']
         total_page = (total_item + limit - 1) // limit if total_item > 0 else 1
         
         # Get status breakdown for logging
-        available_count = session.query(DishModel).filter(DishModel.status == 'Available').count()
-        unavailable_count = session.query(DishModel).filter(DishModel.status == 'Unavailable').count()
-        hidden_count = session.query(DishModel).filter(DishModel.status == 'Hidden').count()
+        available_count = status_counts['available']
+        unavailable_count = status_counts['unavailable']
+        hidden_count = status_counts['hidden']
         
-        print(f"📄 Pagination request: page={page}, limit={limit}, offset={offset}")
-        print(f"📄 Total items: {total_item} (Available: {available_count}, Unavailable: {unavailable_count}, Hidden: {hidden_count})")
-        print(f"📄 Total pages: {total_page}, Items in this page: {len(dishes)}")
-        
-        # Log status of dishes in current page
-        status_breakdown = {}
-        for dish in dishes:
-            status = dish.status
-            status_breakdown[status] = status_breakdown.get(status, 0) + 1
-        print(f"📄 Status in current page: {status_breakdown}")
+        logger.debug('Dish page %s (limit %s): %s of %s items (Available: %s, Unavailable: %s, Hidden: %s), %s pages',
+                     page, limit, len(dishes), total_item, available_count, unavailable_count, hidden_count, total_page)
         
         # Format dishes with full image URLs
         dishes_data = []
         for dish in dishes:
-            dish_dict = dish.to_dict()
-            original_image = dish_dict.get('image')
-            formatted_image = _format_image_url(original_image)
-            dish_dict['image'] = formatted_image
-            print(f"📸 Dish ID {dish.id} ({dish.name}): original='{original_image}' -> formatted='{formatted_image}'")
-            dishes_data.append(dish_dict)
+            dishes_data.append(_serialize_dish(dish))
         
         response = jsonify({
             'data': {
@@ -202,14 +189,17 @@ def get_dish_list_with_pagination_service(page, limit):
 
 def get_dish_detail_service(dish_id):
     """Get dish detail"""
+    return cached_json_response(menu_cache, ('detail', dish_id), lambda: _build_dish_detail_response(dish_id))
+
+def _build_dish_detail_response(dish_id):
+    """Query and serialize one dish (cache miss path of get_dish_detail_service)"""
     from flask import abort
     session = get_session()
     try:
         dish = session.query(DishModel).filter_by(id=dish_id).first()
         if not dish:
             abort(404)
-        dish_dict = dish.to_dict()
-        dish_dict['image'] = _format_image_url(dish_dict['image'])
+        dish_dict = _serialize_dish(dish)
         response = jsonify({
             'data': dish_dict,
             'message': 'Lấy thông tin món ăn thành công!'
@@ -237,9 +227,7 @@ def create_dish_service(body):
         
         # Normalize image path before saving to database
         original_image = body.get('image') or ''
-        image_path = _normalize_image_path(original_image)
-        print(f"🖼️  Original image: {original_image}")
-        print(f"🖼️  Normalized image path: {image_path}")
+        image_path = normalize_image_path(original_image)
         
         # Get status from body, default to 'Available'
         dish_status = body.get('status', 'Available')
@@ -247,7 +235,6 @@ def create_dish_service(body):
         category = body.get('category')
         if category and category not in ('main', 'side', 'drink'):
             category = None
-        print(f"📝 Creating dish with status: {dish_status}, category: {category}")
         
         dish = DishModel(
             name=body.get('name', ''),
@@ -259,15 +246,11 @@ def create_dish_service(body):
         )
         session.add(dish)
         session.commit()
+        invalidate_menu_cache()
         session.refresh(dish)
-        dish_dict = dish.to_dict()
-        
-        print(f"🖼️  Image from DB: {dish_dict['image']}")
-        formatted_image = _format_image_url(dish_dict['image'])
-        dish_dict['image'] = formatted_image
-        print(f"🖼️  Formatted image URL: {formatted_image}")
+        dish_dict = _serialize_dish(dish)
         
-        print(f"✅ Dish created: ID={dish_dict['id']}, Name={dish_dict['name']}, Status={dish_dict['status']}")
+        logger.info('Dish created: id=%s, status=%s, category=%s, image=%r', dish_dict['id'], dish_status, category, image_path)
         
         # Get updated pagination info for frontend
         total_item = session.query(DishModel).count()
@@ -275,14 +258,11 @@ def create_dish_service(body):
         default_limit = 10
         total_page = (total_item + default_limit - 1) // default_limit if total_item > 0 else 1
         
-        print(f"📊 Pagination: totalItem={total_item}, totalPage={total_page}, currentPage=1")
-        
         # Emit socket event to notify frontend about new dish
         try:
             emit_to_manager('new-dish', dish_dict)
-            print(f"📡 Socket event 'new-dish' emitted for dish ID={dish_dict['id']}")
         except Exception as e:
-            print(f"⚠️  Failed to emit socket event: {str(e)}")
+            logger.warning("Failed to emit 'new-dish' for dish %s: %s", dish_dict['id'], e)
         
         response = jsonify({
             'data': dish_dict,
@@ -299,7 +279,6 @@ def create_dish_service(body):
             'newDishId': dish_dict['id']
         })
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
-        print(f"✅ Response sent for dish ID={dish_dict['id']}")
         return response, 200
     except Exception as e:
         session.rollback()
@@ -340,9 +319,7 @@ def update_dish_service(dish_id, body):
         # Normalize image path if provided
         if 'image' in body:
             original_image = body.get('image') or ''
-            image_path = _normalize_image_path(original_image)
-            print(f"🖼️  Update dish - Original image: {original_image}")
-            print(f"🖼️  Update dish - Normalized image path: {image_path}")
+            image_path = normalize_image_path(original_image)
             dish.image = image_path
         
         if 'status' in body:
@@ -353,11 +330,11 @@ def update_dish_service(dish_id, body):
             dish.category = category if category in ('main', 'side', 'drink') else None
         
         session.commit()
+        invalidate_menu_cache()
         session.refresh(dish)
-        dish_dict = dish.to_dict()
-        dish_dict['image'] = _format_image_url(dish_dict['image'])
+        dish_dict = _serialize_dish(dish)
         
-        print(f"✅ Dish updated: ID={dish_dict['id']}, Name={dish_dict['name']}, Image={dish_dict['image']}")
+        logger.info('Dish updated: id=%s, fields=%s', dish_dict['id'], sorted(body.keys()))
         
         # Emit socket event to notify frontend about updated dish
         emit_to_manager('update-dish', dish_dict)
@@ -370,9 +347,7 @@ def update_dish_service(dish_id, body):
         return response, 200
     except Exception as e:
         session.rollback()
-        current_app.logger.error(f"❌ Error updating dish {dish_id}: {str(e)}")
-        import traceback
-        current_app.logger.error(traceback.format_exc())
+        logger.exception('Error updating dish %s', dish_id)
         # Re-raise domain exceptions (EntityError, AuthError, etc.) to be handled by error handlers
         from domain.exceptions import EntityError, AuthError, ForbiddenError, StatusError
         if isinstance(e, (EntityError, AuthError, ForbiddenError, StatusError)):
@@ -412,6 +387,7 @@ def delete_dish_service(dish_id, force_delete=False):
         dish_dict = dish.to_dict()
         orders_count = 0
         snapshots_kept = 0
+        rollup_keys = set()
         
         if dish_snapshots:
             from infrastructure.models.dish_model import DishSnapshotModel
@@ -426,12 +402,19 @@ def delete_dish_service(dish_id, force_delete=False):
             
             orders_count = len(orders_with_snapshots)
             
+            # Revenue rollup buckets of these orders: removed on force delete,
+            # otherwise moved from this dish to the "no dish" (NULL) bucket
+            rollup_keys = daily_revenue_keys(session, [order.id for order in orders_with_snapshots])
+            if not force_delete:
+                rollup_keys |= {(day, None) for day, _ in rollup_keys}
+            
             if force_delete:
                 # Force delete: Delete all orders first, then snapshots will be deleted by cascade
                 if orders_count > 0:
                     for order in orders_with_snapshots:
                         session.delete(order)
-                    current_app.logger.info(f"🗑️  Force delete: Deleted {orders_count} orders related to dish {dish_id}")
+                    logger.info('Force delete: deleted %s orders related to dish %s', orders_count, dish_id)
+                    refresh_daily_revenue_rollup(session, rollup_keys)
                 # Snapshots will be deleted by cascade when dish is deleted
             else:
                 # Normal delete: Keep snapshots with orders (set dish_id = NULL), delete orphan snapshots
@@ -446,28 +429,31 @@ def delete_dish_service(dish_id, force_delete=False):
                         snapshot.dish_id = None
                         snapshots_to_keep.append(snapshot.id)
                         snapshots_kept += 1
-                        current_app.logger.info(f"💾 Keeping snapshot {snapshot.id} (has orders) - set dish_id to NULL")
+                        logger.debug('Keeping snapshot %s (has orders), dish_id set to NULL', snapshot.id)
                     else:
                         # Snapshot has no orders: mark for deletion
                         snapshots_to_delete.append(snapshot.id)
-                        current_app.logger.info(f"🗑️  Snapshot {snapshot.id} has no orders - will be deleted")
+                        logger.debug('Snapshot %s has no orders, will be deleted', snapshot.id)
                 
-                # Commit the dish_id = NULL changes first to prevent cascade issues
+                # Commit the dish_id = NULL changes first to prevent cascade issues,
+                # together with the rollup buckets the orders move to
                 if snapshots_to_keep:
+                    refresh_daily_revenue_rollup(session, rollup_keys)
                     session.commit()
-                    current_app.logger.info(f"✅ Committed dish_id = NULL for {len(snapshots_to_keep)} snapshots")
+                    logger.info('Detached %s snapshots with orders from dish %s', len(snapshots_to_keep), dish_id)
                 
                 # Manually delete orphan snapshots (those without orders)
                 if snapshots_to_delete:
                     session.query(DishSnapshotModel).filter(
                         DishSnapshotModel.id.in_(snapshots_to_delete)
                     ).delete(synchronize_session=False)
-                    current_app.logger.info(f"🗑️  Deleted {len(snapshots_to_delete)} orphan snapshots")
+                    logger.info('Deleted %s orphan snapshots of dish %s', len(snapshots_to_delete), dish_id)
         
         # Now delete the dish (snapshots with orders are already detached, orphan snapshots are deleted)
         dish_dict = dish.to_dict()
         session.delete(dish)
         session.commit()
+        invalidate_menu_cache()
         
         # Emit socket event to notify frontend about deleted dish
         emit_to_manager('delete-dish', {'id': dish_id})
@@ -494,7 +480,7 @@ def delete_dish_service(dish_id, force_delete=False):
         raise
     except IntegrityError as e:
         session.rollback()
-        current_app.logger.error(f"❌ IntegrityError when deleting dish {dish_id}: {str(e)}")
+        logger.error('IntegrityError when deleting dish %s: %s', dish_id, e)
         # Check if it's a foreign key constraint issue
         error_msg = str(e).lower()
         if 'foreign key' in error_msg or 'constraint' in error_msg:
@@ -506,9 +492,7 @@ def delete_dish_service(dish_id, force_delete=False):
         raise
     except Exception as e:
         session.rollback()
-        current_app.logger.error(f"❌ Error deleting dish {dish_id}: {str(e)}")
-        import traceback
-        current_app.logger.error(traceback.format_exc())
+        logger.exception('Error deleting dish %s', dish_id)
         # Convert other errors to EntityError
         raise EntityError([{'field': 'general', 'message': f'Lỗi khi xóa món ăn: {str(e)}'}])
     finally:
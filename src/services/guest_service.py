@@ -2,16 +2,17 @@ from flask import jsonify, g
 from infrastructure.databases import get_session
 from infrastructure.models.guest_model import GuestModel
 from infrastructure.models.table_model import TableModel
-from infrastructure.models.dish_model import DishModel
-from infrastructure.models.dish_model import DishSnapshotModel
 from infrastructure.models.order_model import OrderModel
 from utils.jwt_utils import sign_access_token, sign_refresh_token, verify_refresh_token
-from domain.constants import Role, TableStatus, DishStatus, OrderStatus
+from domain.constants import Role, TableStatus
 from domain.exceptions import AuthError
 from config import Config
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from utils.jwt_utils import parse_time_string
 from utils.socket_utils import emit_to_manager
+from services.indicator_service import daily_revenue_keys, refresh_daily_revenue_rollup
+from services.order_service import bulk_create_orders
 
 def guest_login_service(body):
     """Guest login"""
@@ -157,50 +158,14 @@ def guest_create_orders_service(body):
         if table.status == TableStatus.Reserved:
             raise ValueError(f'Bàn {table.number} đã được đặt trước, vui lòng đăng xuất và chọn bàn khác')
         
-        orders = []
-        for order_data in body:
-            dish = session.query(DishModel).get(order_data['dishId'])
-            if not dish:
-                abort(404)
-            
-            if dish.status == DishStatus.Unavailable:
-                raise ValueError(f'Món {dish.name} đã hết')
-            
-            if dish.status == DishStatus.Hidden:
-                raise ValueError(f'Món {dish.name} không thể đặt')
-            
-            dish_snapshot = DishSnapshotModel(
-                name=dish.name,
-                price=dish.price,
-                description=dish.description,
-                image=dish.image,
-                status=dish.status,
-                category=getattr(dish, 'category', None),
-                dish_id=dish.id
-            )
-            session.add(dish_snapshot)
-            session.flush()
-            
-            order = OrderModel(
-                dish_snapshot_id=dish_snapshot.id,
-                guest_id=guest.id,
-                quantity=order_data['quantity'],
-                note=order_data.get('note'),
-                table_number=guest.table_number,
-                order_handler_id=None,
-                status=OrderStatus.Pending
-            )
-            session.add(order)
-            orders.append(order)
-        
+        orders = bulk_create_orders(session, guest, body, None)
+        # Serialize before commit: ids and defaults are already set by the flush,
+        # and committing would expire them
+        orders_data = [order.to_dict() for order in orders]
+        refresh_daily_revenue_rollup(session, daily_revenue_keys(session, [order.id for order in orders]))
         session.commit()
         
-        # Refresh orders to get relationships
-        for order in orders:
-            session.refresh(order)
-        
         # Emit socket event
-        orders_data = [order.to_dict() for order in orders]
         emit_to_manager('new-order', orders_data)
         
         return jsonify({
@@ -212,53 +177,20 @@ def guest_create_orders_service(body):
 
 def guest_get_orders_service():
     """Guest get orders"""
-    from infrastructure.models.dish_model import DishSnapshotModel
-    from config import Config
-    
-    def _format_image_url(image_path):
-        """Format image URL to full URL if needed"""
-        if not image_path:
-            return None
-        
-        # If already a full URL, normalize it first (extract filename)
-        if image_path.startswith('http://') or image_path.startswith('https://'):
-            # Extract filename from URL (normalize production URLs to filename)
-            if '/static/' in image_path:
-                normalized_path = image_path.split('/static/')[-1]
-            else:
-                # Try to extract last part of URL
-                normalized_path = image_path.split('/')[-1]
-        else:
-            # Normalize path (remove leading slash and static/ prefix if exists)
-            normalized_path = str(image_path).lstrip('/')
-            if normalized_path.startswith('static/'):
-                normalized_path = normalized_path[7:]
-        
-        # If path is empty after normalization, return None
-        if not normalized_path:
-            return None
-        
-        # Get API URL from config instance
-        config = Config()
-        api_url = config.API_URL
-        result_url = f"{api_url}/static/{normalized_path}"
-        return result_url
-    
     session = get_session()
     try:
-        orders = session.query(OrderModel).filter_by(guest_id=g.current_user_id).all()
+        # Snapshots come in the same query instead of one lookup per order
+        orders = session.query(OrderModel).options(joinedload(OrderModel.dish_snapshot)).filter_by(
+            guest_id=g.current_user_id
+        ).order_by(OrderModel.id).all()
         
         # Build response with dishSnapshot included
         orders_data = []
         for order in orders:
             order_dict = order.to_dict()
-            # Query dish_snapshot separately
-            dish_snapshot = session.query(DishSnapshotModel).get(order.dish_snapshot_id)
+            dish_snapshot = order.dish_snapshot
             if dish_snapshot:
-                dish_snapshot_dict = dish_snapshot.to_dict()
-                # Format image URL to full URL
-                dish_snapshot_dict['image'] = _format_image_url(dish_snapshot_dict.get('image'))
-                order_dict['dishSnapshot'] = dish_snapshot_dict
+                order_dict['dishSnapshot'] = dish_snapshot.to_dict(resolve_image=True)
             else:
                 # If dish_snapshot not found, set to null to prevent frontend errors
                 order_dict['dishSnapshot'] = None
@@ -2,12 +2,223 @@ from flask import jsonify
 from infrastructure.databases import get_session
 from infrastructure.models.order_model import OrderModel
 from infrastructure.models.guest_model import GuestModel
-from infrastructure.models.dish_model import DishModel
+from infrastructure.models.dish_model import DishModel, DishSnapshotModel
+from infrastructure.models.daily_revenue_model import DailyDishRevenueModel, DailyGuestActivityModel
 from domain.constants import OrderStatus
-from config import Config
-from datetime import timedelta
+from sqlalchemy import and_, or_, case, cast, distinct, func, select, true, union, Date
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime, time, timedelta, timezone
 from dateutil import parser
-from dateutil.tz import gettz
+
+SERVING_STATUSES = [OrderStatus.Processing, OrderStatus.Pending, OrderStatus.Delivered]
+
+def _order_day_expression(session):
+    """SQL expression truncating Order.created_at to its calendar day"""
+    # SQLite has no DATE type: CAST(... AS DATE) yields a number, use date() instead
+    if session.get_bind().dialect.name == 'sqlite':
+        return func.date(OrderModel.created_at)
+    return cast(OrderModel.created_at, Date)
+
+def _as_day(value):
+    """Normalize a day returned by the database (date, datetime or 'YYYY-MM-DD' string)"""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+def _day_start(day):
+    return datetime.combine(day, time.min)
+
+def _to_naive_utc(value):
+    """Order.created_at is stored as naive UTC, compare against the same"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _full_day_span(range_start, range_end):
+    """First and last calendar day entirely inside [range_start, range_end], or None"""
+    first_day = range_start.date() if range_start.time() == time.min else range_start.date() + timedelta(days=1)
+    # toDate is sent as end of day (23:59:59.999) by the dashboard
+    last_day = range_end.date() if range_end.time() >= time(23, 59, 59, 999000) else range_end.date() - timedelta(days=1)
+    if first_day > last_day:
+        return None
+    return first_day, last_day
+
+def _daily_revenue_query(session):
+    """Orders aggregated per (day, dish_id), in DailyDishRevenueModel column order"""
+    order_day = _order_day_expression(session)
+    is_paid = OrderModel.status == OrderStatus.Paid
+    return session.query(
+        order_day,
+        DishSnapshotModel.dish_id,
+        func.sum(case((is_paid, DishSnapshotModel.price * OrderModel.quantity), else_=0)),
+        func.count(OrderModel.id),
+        func.sum(case((is_paid, 1), else_=0))
+    ).join(DishSnapshotModel, DishSnapshotModel.id == OrderModel.dish_snapshot_id).group_by(
+        order_day, DishSnapshotModel.dish_id
+    )
+
+def _guest_activity_query(session):
+    """Paid and still-served orders per (day, guest_id, table_number), in DailyGuestActivityModel column order"""
+    order_day = _order_day_expression(session)
+    paid_count = func.sum(case((OrderModel.status == OrderStatus.Paid, 1), else_=0))
+    serving_count = func.sum(case((OrderModel.status.in_(SERVING_STATUSES), 1), else_=0))
+    return session.query(
+        order_day,
+        OrderModel.guest_id,
+        OrderModel.table_number,
+        paid_count,
+        serving_count
+    ).group_by(order_day, OrderModel.guest_id, OrderModel.table_number).having(
+        or_(paid_count > 0, serving_count > 0)
+    )
+
+def _id_filter(column, ids):
+    """column IN ids, also matching NULL when None is one of them"""
+    filters = []
+    values = {value for value in ids if value is not None}
+    if values:
+        filters.append(column.in_(values))
+    if None in ids:
+        filters.append(column.is_(None))
+    return or_(*filters)
+
+def daily_revenue_keys(session, order_ids):
+    """Rollup buckets (day, dish_id, guest_id) the given orders currently fall into"""
+    if not order_ids:
+        return set()
+    order_day = _order_day_expression(session)
+    rows = session.query(order_day, DishSnapshotModel.dish_id, OrderModel.guest_id).join(
+        DishSnapshotModel, DishSnapshotModel.id == OrderModel.dish_snapshot_id
+    ).filter(OrderModel.id.in_(list(order_ids))).distinct().all()
+    return {(_as_day(day), dish_id, guest_id) for day, dish_id, guest_id in rows}
+
+def _day_range(days):
+    return and_(
+        OrderModel.created_at >= _day_start(min(days)),
+        OrderModel.created_at < _day_start(max(days) + timedelta(days=1))
+    )
+
+def _insert_rollup_row(session, model, **key):
+    """INSERT a new rollup row in a savepoint
+    
+    A concurrent transaction writing to the same new bucket makes the INSERT hit
+    the unique constraint: only the savepoint is rolled back and the row the
+    other writer committed is updated instead.
+    """
+    try:
+        with session.begin_nested():
+            row = model(**key)
+            session.add(row)
+        return row
+    except IntegrityError:
+        return session.query(model).filter_by(**key).one()
+
+def _refresh_dish_buckets(session, keys):
+    """Recompute DailyDishRevenue rows for (day, dish_id) keys"""
+    days = {day for day, _ in keys}
+    dish_ids = {dish_id for _, dish_id in keys}
+    rows = _daily_revenue_query(session).filter(
+        _day_range(days), _id_filter(DishSnapshotModel.dish_id, dish_ids)
+    ).all()
+    totals = {(_as_day(row[0]), row[1]): row[2:] for row in rows}
+    
+    existing = {
+        (rollup.day, rollup.dish_id): rollup
+        for rollup in session.query(DailyDishRevenueModel).filter(
+            DailyDishRevenueModel.day.in_(days),
+            _id_filter(DailyDishRevenueModel.dish_id, dish_ids)
+        ).all()
+    }
+    
+    for key in keys:
+        rollup = existing.get(key)
+        if key not in totals:
+            # No orders left in this bucket
+            if rollup:
+                session.delete(rollup)
+            continue
+        if not rollup:
+            rollup = _insert_rollup_row(session, DailyDishRevenueModel, day=key[0], dish_id=key[1])
+        revenue, order_count, paid_count = totals[key]
+        rollup.revenue = int(revenue or 0)
+        rollup.order_count = order_count
+        rollup.paid_count = int(paid_count or 0)
+
+def _refresh_guest_activity(session, keys):
+    """Recompute DailyGuestActivity rows of the (day, guest_id) keys, every table of the guest"""
+    days = {day for day, _ in keys}
+    guest_ids = {guest_id for _, guest_id in keys}
+    totals = {
+        (_as_day(day), guest_id, table_number): (int(paid_count or 0), int(serving_count or 0))
+        for day, guest_id, table_number, paid_count, serving_count in _guest_activity_query(session).filter(
+            _day_range(days), _id_filter(OrderModel.guest_id, guest_ids)
+        ).all()
+        if (_as_day(day), guest_id) in keys
+    }
+    
+    existing = {}
+    for activity in session.query(DailyGuestActivityModel).filter(
+        DailyGuestActivityModel.day.in_(days),
+        _id_filter(DailyGuestActivityModel.guest_id, guest_ids)
+    ).all():
+        if (activity.day, activity.guest_id) not in keys:
+            continue
+        key = (activity.day, activity.guest_id, activity.table_number)
+        if key not in totals:
+            session.delete(activity)
+        else:
+            existing[key] = activity
+    
+    for key, (paid_count, serving_count) in totals.items():
+        activity = existing.get(key)
+        if not activity:
+            activity = _insert_rollup_row(session, DailyGuestActivityModel, day=key[0], guest_id=key[1], table_number=key[2])
+        activity.paid_count = paid_count
+        activity.serving_count = serving_count
+
+def refresh_daily_revenue_rollup(session, keys):
+    """Recompute the rollup rows of the given (day, dish_id, guest_id) keys from Order rows
+    
+    Called by order writers before their commit, so orders and rollups are
+    committed (or rolled back) together.
+    """
+    if not keys:
+        return
+    session.flush()
+    _refresh_dish_buckets(session, {(day, dish_id) for day, dish_id, _ in keys})
+    _refresh_guest_activity(session, {(day, guest_id) for day, _, guest_id in keys})
+
+def rebuild_daily_revenue_rollup(session):
+    """Rebuild both rollup tables from Order rows (caller commits), return the (day, dish) bucket count"""
+    session.query(DailyDishRevenueModel).delete(synchronize_session=False)
+    session.query(DailyGuestActivityModel).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    rows = _daily_revenue_query(session).all()
+    session.bulk_insert_mappings(DailyDishRevenueModel, [
+        {
+            'day': _as_day(day),
+            'dish_id': dish_id,
+            'revenue': int(revenue or 0),
+            'order_count': order_count,
+            'paid_count': int(paid_count or 0),
+            'updated_at': now
+        }
+        for day, dish_id, revenue, order_count, paid_count in rows
+    ])
+    session.bulk_insert_mappings(DailyGuestActivityModel, [
+        {
+            'day': _as_day(day),
+            'guest_id': guest_id,
+            'table_number': table_number,
+            'paid_count': int(paid_count or 0),
+            'serving_count': int(serving_count or 0),
+            'updated_at': now
+        }
+        for day, guest_id, table_number, paid_count, serving_count in _guest_activity_query(session).all()
+    ])
+    return len(rows)
 
 def dashboard_indicator_service(from_date, to_date):
     """Get dashboard indicators"""
@@ -19,28 +230,81 @@ def dashboard_indicator_service(from_date, to_date):
         if isinstance(to_date, str):
             to_date = parser.parse(to_date)
         
-        # Get orders
-        orders = session.query(OrderModel).filter(
-            OrderModel.created_at >= from_date,
-            OrderModel.created_at <= to_date
-        ).order_by(OrderModel.created_at.desc()).all()
+        range_start = _to_naive_utc(from_date)
+        range_end = _to_naive_utc(to_date)
+        in_range = and_(OrderModel.created_at >= range_start, OrderModel.created_at <= range_end)
+        is_paid = OrderModel.status == OrderStatus.Paid
+        is_serving = OrderModel.status.in_(SERVING_STATUSES)
+        
+        # Whole days are read from the rollups, only the partial days at the
+        # edges of the range are aggregated from Order rows
+        full_days = _full_day_span(range_start, range_end)
+        if full_days:
+            first_day, last_day = full_days
+            is_edge = or_(
+                OrderModel.created_at < _day_start(first_day),
+                OrderModel.created_at >= _day_start(last_day + timedelta(days=1))
+            )
+        else:
+            is_edge = true()
+        edge_range = and_(in_range, is_edge)
+        
+        # Distinct guests with paid orders and serving tables can't be summed:
+        # union the keys of the edge orders with DailyGuestActivity of the whole days
+        paid_guests = [select(OrderModel.guest_id.label('guest_id')).where(edge_range, is_paid)]
+        serving_tables = [select(OrderModel.table_number.label('table_number')).where(edge_range, is_serving)]
+        if full_days:
+            in_full_days = and_(DailyGuestActivityModel.day >= first_day, DailyGuestActivityModel.day <= last_day)
+            paid_guests.append(select(DailyGuestActivityModel.guest_id).where(in_full_days, DailyGuestActivityModel.paid_count > 0))
+            serving_tables.append(select(DailyGuestActivityModel.table_number).where(in_full_days, DailyGuestActivityModel.serving_count > 0))
+        paid_guests = union(*paid_guests).subquery()
+        serving_tables = union(*serving_tables).subquery()
         
-        # Get guests with paid orders
-        guest_ids = set()
-        for order in orders:
-            if order.status == OrderStatus.Paid and order.guest_id:
-                guest_ids.add(order.guest_id)
+        order_count, guest_count, serving_table_count = session.query(
+            select(func.count(OrderModel.id)).where(edge_range).scalar_subquery(),
+            select(func.count(distinct(GuestModel.id))).join(paid_guests, paid_guests.c.guest_id == GuestModel.id).scalar_subquery(),
+            select(func.count(distinct(serving_tables.c.table_number))).scalar_subquery()
+        ).one()
         
-        guests = session.query(GuestModel).filter(GuestModel.id.in_(list(guest_ids))).all()
+        # Revenue of paid orders grouped by day
+        order_day = _order_day_expression(session)
+        revenue_rows = session.query(
+            order_day,
+            func.sum(DishSnapshotModel.price * OrderModel.quantity)
+        ).join(DishSnapshotModel, DishSnapshotModel.id == OrderModel.dish_snapshot_id).filter(
+            edge_range, is_paid
+        ).group_by(order_day).all()
+        
+        # Successful (paid) orders grouped by dish
+        success_orders_by_dish = {}
+        for dish_id, success_orders in session.query(
+            DishSnapshotModel.dish_id,
+            func.count(OrderModel.id)
+        ).join(DishSnapshotModel, DishSnapshotModel.id == OrderModel.dish_snapshot_id).filter(
+            edge_range, is_paid, DishSnapshotModel.dish_id.isnot(None)
+        ).group_by(DishSnapshotModel.dish_id).all():
+            success_orders_by_dish[dish_id] = success_orders
+        
+        if full_days:
+            in_full_days = and_(DailyDishRevenueModel.day >= first_day, DailyDishRevenueModel.day <= last_day)
+            rollup_by_day = session.query(
+                DailyDishRevenueModel.day,
+                func.sum(DailyDishRevenueModel.revenue),
+                func.sum(DailyDishRevenueModel.order_count)
+            ).filter(in_full_days).group_by(DailyDishRevenueModel.day).all()
+            for day, day_revenue, day_order_count in rollup_by_day:
+                revenue_rows.append((day, day_revenue))
+                order_count += int(day_order_count or 0)
+            
+            for dish_id, paid_count in session.query(
+                DailyDishRevenueModel.dish_id,
+                func.sum(DailyDishRevenueModel.paid_count)
+            ).filter(in_full_days, DailyDishRevenueModel.dish_id.isnot(None)).group_by(DailyDishRevenueModel.dish_id).all():
+                success_orders_by_dish[dish_id] = success_orders_by_dish.get(dish_id, 0) + int(paid_count or 0)
         
         # Get all dishes
         dishes = session.query(DishModel).all()
         
-        # Calculate revenue
-        revenue = 0
-        guest_count = len(guests)
-        order_count = len(orders)
-        
         # Dish indicator
         dish_indicator_obj = {}
         for dish in dishes:
@@ -53,45 +317,25 @@ def dashboard_indicator_service(from_date, to_date):
                 'status': dish.status,
                 'createdAt': dish.created_at.isoformat() if dish.created_at else None,
                 'updatedAt': dish.updated_at.isoformat() if dish.updated_at else None,
-                'successOrders': 0
+                'successOrders': success_orders_by_dish.get(dish.id, 0)
             }
         
         # Revenue by date
         revenue_by_date_obj = {}
         current_date = from_date
-        tz = gettz(Config.SERVER_TIMEZONE)
         
         while current_date <= to_date:
             date_str = current_date.strftime('%d/%m/%Y')
             revenue_by_date_obj[date_str] = 0
             current_date += timedelta(days=1)
         
-        # Table number obj
-        table_number_obj = {}
-        
-        # Process orders
-        from infrastructure.models.dish_model import DishSnapshotModel
-        for order in orders:
-            if order.status == OrderStatus.Paid:
-                # Get dish snapshot price
-                dish_snapshot = session.query(DishSnapshotModel).get(order.dish_snapshot_id)
-                if dish_snapshot:
-                    order_revenue = dish_snapshot.price * order.quantity
-                    revenue += order_revenue
-                    
-                    if dish_snapshot.dish_id and dish_snapshot.dish_id in dish_indicator_obj:
-                        dish_indicator_obj[dish_snapshot.dish_id]['successOrders'] += 1
-                    
-                    # Revenue by date
-                    date_str = order.created_at.strftime('%d/%m/%Y')
-                    if date_str in revenue_by_date_obj:
-                        revenue_by_date_obj[date_str] += order_revenue
-            
-            if order.status in [OrderStatus.Processing, OrderStatus.Pending, OrderStatus.Delivered]:
-                if order.table_number:
-                    table_number_obj[order.table_number] = True
-        
-        serving_table_count = len(table_number_obj)
+        revenue = 0
+        for day, day_revenue in revenue_rows:
+            day_revenue = int(day_revenue or 0)
+            revenue += day_revenue
+            date_str = _as_day(day).strftime('%d/%m/%Y')
+            if date_str in revenue_by_date_obj:
+                revenue_by_date_obj[date_str] += day_revenue
         
         # Revenue by date
         revenue_by_date = [{'date': date, 'revenue': revenue} for date, revenue in revenue_by_date_obj.items()]
@@ -110,4 +354,3 @@ def dashboard_indicator_service(from_date, to_date):
         }), 200
     finally:
         session.close()
-
@@ -1,8 +1,27 @@
-from flask import jsonify, request, current_app
+from flask import jsonify, request, abort, send_file, current_app
 from werkzeug.utils import secure_filename
+from werkzeug.http import is_resource_modified, http_date
 from utils.helpers import random_id, create_folder
+from utils.cache_utils import ExpiringLRUCache
+from utils.image_variants import schedule_variants
+from utils.image_url import image_url
 from config import Config
+from utils.logging_utils import get_logger
+from datetime import datetime, timezone
+import mimetypes
 import os
+import stat
+import time
+
+logger = get_logger(__name__)
+
+# os.stat results of uploaded files by file name. Misses are not cached: image variants
+# appear in the background after their URLs are handed out. Uploads always get a new
+# random name, so entries only go stale when a file is removed by hand
+static_stat_cache = ExpiringLRUCache(Config.STATIC_STAT_CACHE_SIZE)
+
+# Uploaded file names never change content
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
@@ -12,20 +31,9 @@ def allowed_file(filename):
 def upload_image_service():
     """Upload image"""
     try:
-        # Enhanced logging
-        print(f"📤 Upload request - Content-Type: {request.content_type}")
-        print(f"📤 Upload request - Method: {request.method}")
-        print(f"📤 Upload request - Has files: {bool(request.files)}")
-        print(f"📤 Upload request - Files keys: {list(request.files.keys()) if request.files else []}")
-        print(f"📤 Upload request - Form keys: {list(request.form.keys()) if request.form else []}")
-        print(f"📤 Upload request - Is JSON: {request.is_json}")
-        print(f"📤 Upload request - Content Length: {request.content_length}")
-        
-        current_app.logger.info(f"📤 Upload request - Content-Type: {request.content_type}")
-        current_app.logger.info(f"📤 Upload request - Method: {request.method}")
-        current_app.logger.info(f"📤 Upload request - Has files: {bool(request.files)}")
-        current_app.logger.info(f"📤 Upload request - Files keys: {list(request.files.keys()) if request.files else []}")
-        current_app.logger.info(f"📤 Upload request - Form keys: {list(request.form.keys()) if request.form else []}")
+        logger.debug('Upload request: content_type=%s, content_length=%s, files=%s, form=%s',
+                     request.content_type, request.content_length,
+                     list(request.files.keys()), list(request.form.keys()))
         
         # Check if request has files
         if not request.files:
@@ -75,32 +83,28 @@ def upload_image_service():
         
         # Ensure upload folder exists
         create_folder(Config.UPLOAD_FOLDER)
-        current_app.logger.info(f"📤 Upload folder: {Config.UPLOAD_FOLDER}")
         
         unique_id = random_id()
         ext = os.path.splitext(file.filename)[1].lower()
         filename = unique_id + ext
         filepath = os.path.join(Config.UPLOAD_FOLDER, filename)
         
-        current_app.logger.info(f"📤 Upload file name: {file.filename}")
-        current_app.logger.info(f"📤 Upload file size: {file_length} bytes")
-        current_app.logger.info(f"📤 Saving file to: {filepath}")
-        
         # Save file
         file.save(filepath)
+        static_stat_cache.pop(filename)
+        
+        # Thumbnail/card/full variants are written by a background pool; a dish
+        # created before they are ready picks them up once the menu cache is dropped
+        from services.dish_service import invalidate_menu_cache
+        schedule_variants(filename, on_done=lambda _: invalidate_menu_cache())
         
         # Verify file was saved
         if not os.path.exists(filepath):
             from domain.exceptions import EntityError
             raise EntityError([{'field': 'file', 'message': 'Lỗi khi lưu file'}])
         
-        file_size = os.path.getsize(filepath)
-        current_app.logger.info(f"✅ File saved successfully. Size: {file_size} bytes")
-
-        config = Config() # Instantiate Config
-        api_url = config.API_URL # Access property correctly
-        url = f"{api_url}/static/{filename}"
-        current_app.logger.info(f"✅ Upload URL: {url}")
+        url = image_url(filename)
+        logger.info('Uploaded %s (%s bytes) as %s', file.filename, file_length, filename)
         
         response = jsonify({
             'message': 'Upload ảnh thành công',
@@ -109,14 +113,11 @@ def upload_image_service():
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
         return response, 200
     except Exception as e:
-        current_app.logger.error(f"❌ Error in upload_image_service: {str(e)}")
-        current_app.logger.error(f"❌ Error type: {type(e).__name__}")
-        import traceback
-        current_app.logger.error(traceback.format_exc())
-        
         # Re-raise EntityError as is
         if isinstance(e, Exception) and hasattr(e, 'errors'):
+            logger.info('Upload rejected: %s', e.errors)
             raise
+        logger.exception('Error in upload_image_service')
         
         # Handle specific Flask errors
         from werkzeug.exceptions import RequestEntityTooLarge
@@ -128,3 +129,57 @@ def upload_image_service():
         from domain.exceptions import EntityError
         raise EntityError([{'field': 'file', 'message': f'Lỗi upload: {str(e)}'}])
 
+
+def _stat_upload(filename):
+    """(path, size, mtime, etag) of an uploaded file, None when it does not exist"""
+    cached = static_stat_cache.get(filename)
+    if cached is not None:
+        return cached
+    
+    path = os.path.join(Config.UPLOAD_FOLDER, filename)
+    try:
+        st = os.stat(path)
+        if stat.S_ISREG(st.st_mode):
+            mtime = datetime.fromtimestamp(int(st.st_mtime), tz=timezone.utc)
+            info = (path, st.st_size, mtime, f'{int(st.st_mtime):x}-{st.st_size:x}')
+        else:
+            return None
+    except OSError:
+        return None
+    static_stat_cache.set(filename, info, time.time() + Config.STATIC_STAT_CACHE_TTL)
+    return info
+
+def serve_static_file_service(filename):
+    """Serve an uploaded file with ETag/Last-Modified, 304 and Range support
+    
+    With STATIC_OFFLOAD the file body is left to the proxy (X-Accel-Redirect for
+    nginx, X-Sendfile for Apache/lighttpd); the app only answers the headers.
+    """
+    # Security: prevent directory traversal
+    filename = os.path.basename(filename)
+    info = _stat_upload(filename) if filename else None
+    if not info:
+        abort(404)
+    path, size, mtime, etag = info
+    
+    # Revalidation answered from the stat cache, without opening the file
+    if not is_resource_modified(request.environ, etag=etag, last_modified=mtime):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+        return response
+    
+    if Config.STATIC_OFFLOAD == 'x-accel-redirect':
+        response = current_app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = f"{Config.STATIC_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{filename}"
+        response.headers['Last-Modified'] = http_date(mtime)
+        response.set_etag(etag)
+    else:
+        # send_file handles Range/206 and uses X-Sendfile when USE_X_SENDFILE is on
+        response = send_file(path, conditional=True, etag=etag, last_modified=mtime)
+    response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+    return response
+
+def get_static_stat_cache_stats():
+    """Hit/miss counters of the uploaded file stat cache"""
+    return static_stat_cache.stats()
@@ -0,0 +1,92 @@
+import hmac
+from flask import Response, request
+from infrastructure.databases import get_db_pool_status
+from services.dish_service import get_menu_cache_stats
+from services.table_service import get_table_cache_stats
+from services.media_service import get_static_stat_cache_stats
+from utils.jwt_utils import get_access_token_cache_stats
+from utils.socket_utils import get_emit_queue_stats
+from utils.compression import get_compression_stats
+from utils.metrics import CONTENT_TYPE, render_family, render_request_metrics
+from domain.exceptions import AuthError
+from config import Config
+
+def _pool_lines():
+    pool = get_db_pool_status()
+    lines = []
+    # Occupancy only exists for QueuePool (SQLite keeps its default pool)
+    for key, name, documentation in (
+        ('size', 'app_db_pool_size', 'Configured pool size'),
+        ('checkedOut', 'app_db_pool_checked_out', 'Connections currently checked out'),
+        ('checkedIn', 'app_db_pool_checked_in', 'Idle connections in the pool'),
+        ('overflow', 'app_db_pool_overflow', 'Connections opened beyond pool_size')
+    ):
+        if key in pool:
+            lines += render_family(name, documentation, 'gauge', [({}, pool[key])])
+    for key, name, documentation in (
+        ('checkouts', 'app_db_pool_checkouts_total', 'Connection checkouts'),
+        ('connectionsCreated', 'app_db_pool_connections_created_total', 'Connections opened'),
+        ('connectionsClosed', 'app_db_pool_connections_closed_total', 'Connections closed'),
+        ('invalidations', 'app_db_pool_invalidations_total', 'Connections invalidated'),
+        ('waitCount', 'app_db_pool_waits_total', 'Checkouts that went through the pool queue'),
+        ('waitSecondsTotal', 'app_db_pool_wait_seconds_total', 'Time spent waiting for a connection')
+    ):
+        lines += render_family(name, documentation, 'counter', [({}, pool[key])])
+    return lines
+
+def _cache_lines():
+    caches = {
+        'menu': get_menu_cache_stats(),
+        'tables': get_table_cache_stats(),
+        'accessToken': get_access_token_cache_stats(),
+        'staticFiles': get_static_stat_cache_stats()
+    }
+    lines = []
+    for key, name, kind, documentation in (
+        ('hits', 'app_cache_hits_total', 'counter', 'In-process cache hits'),
+        ('misses', 'app_cache_misses_total', 'counter', 'In-process cache misses'),
+        ('entries', 'app_cache_entries', 'gauge', 'Entries currently cached')
+    ):
+        lines += render_family(name, documentation, kind, [({'cache': cache}, stats[key]) for cache, stats in caches.items()])
+    return lines
+
+def _access_token_lines():
+    stats = get_access_token_cache_stats()
+    return (
+        render_family('app_jwt_decodes_total', 'Access tokens verified with jwt.decode (cache misses)', 'counter', [({}, stats['decodeCount'])])
+        + render_family('app_jwt_decode_seconds_total', 'Time spent in jwt.decode for access tokens', 'counter', [({}, stats['decodeSecondsTotal'])])
+    )
+
+def _emit_queue_lines():
+    stats = get_emit_queue_stats()
+    lines = render_family('app_socket_emit_pending_rooms', 'Rooms with queued socket events', 'gauge', [({}, stats['pendingRooms'])])
+    for key, name, documentation in (
+        ('enqueued', 'app_socket_emit_enqueued_total', 'Socket events queued'),
+        ('superseded', 'app_socket_emit_superseded_total', 'Queued events replaced by a newer one before the flush'),
+        ('flushes', 'app_socket_emit_flushes_total', 'Room flushes'),
+        ('frames', 'app_socket_emit_frames_total', 'Socket.IO frames sent')
+    ):
+        lines += render_family(name, documentation, 'counter', [({}, stats[key])])
+    return lines
+
+def _compression_lines():
+    encodings = get_compression_stats()['encodings']
+    lines = []
+    for key, name, documentation in (
+        ('responses', 'app_http_compressed_responses_total', 'Responses compressed'),
+        ('bytesIn', 'app_http_compression_bytes_in_total', 'Response bytes before compression'),
+        ('bytesOut', 'app_http_compression_bytes_out_total', 'Response bytes after compression')
+    ):
+        lines += render_family(name, documentation, 'counter', [({'encoding': encoding}, counters[key]) for encoding, counters in encodings.items()])
+    return lines
+
+def metrics_service():
+    """Prometheus text exposition of this process (each worker reports its own counters)"""
+    if Config.METRICS_TOKEN:
+        auth_header = request.headers.get('Authorization', '')
+        token = auth_header.split(' ')[1] if ' ' in auth_header else auth_header
+        if not hmac.compare_digest(token, Config.METRICS_TOKEN):
+            raise AuthError('Metrics token không hợp lệ')
+    
+    lines = render_request_metrics() + _pool_lines() + _cache_lines() + _access_token_lines() + _emit_queue_lines() + _compression_lines()
+    return Response('\n'.join(lines) + '\n', content_type=CONTENT_TYPE)
@@ -1,12 +1,134 @@
-from flask import jsonify, g, current_app
+from flask import jsonify, g, current_app, Response, stream_with_context
+from sqlalchemy import and_, or_, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from infrastructure.databases import get_session
 from infrastructure.models.order_model import OrderModel
 from infrastructure.models.guest_model import GuestModel
 from infrastructure.models.table_model import TableModel
 from infrastructure.models.dish_model import DishModel, DishSnapshotModel
-from infrastructure.models.socket_model import SocketModel
+from infrastructure.models.order_version_model import OrderVersionModel
 from domain.constants import DishStatus, OrderStatus, TableStatus
-from utils.socket_utils import emit_to_manager_and_socket, emit_to_manager
+from domain.exceptions import EntityError
+from config import Config
+from utils.socket_utils import emit_to_manager_and_socket, guest_room
+from services.indicator_service import daily_revenue_keys, refresh_daily_revenue_rollup
+from datetime import datetime, timezone
+import base64
+
+# Fields carried by order-delta events (to_dict keys, without id/version)
+ORDER_DELTA_FIELDS = ('guestId', 'tableNumber', 'dishSnapshotId', 'quantity', 'note', 'orderHandlerId', 'status', 'updatedAt')
+
+def ensure_order_version_counter(session):
+    """Create the OrderVersion counter row if missing, continuing after the highest Order.version
+    
+    Called at startup and by scripts/add_order_version_column.py. Runs in a
+    SAVEPOINT so a concurrent creator (another worker starting) only makes
+    this INSERT fail, not the surrounding transaction.
+    """
+    if session.query(OrderVersionModel.id).filter_by(id=1).first() is not None:
+        return
+    version = session.query(func.max(OrderModel.version)).scalar() or 0
+    try:
+        with session.begin_nested():
+            session.add(OrderVersionModel(id=1, value=version))
+    except IntegrityError:
+        pass
+
+def next_order_version(session):
+    """Reserve the next Order.version for the current transaction
+    
+    One atomic UPDATE ... SET value = value + 1 (with RETURNING where the dialect
+    has it). The counter row stays locked until commit, so versions become
+    visible in increasing order and GET /orders/changes?since= never skips one.
+    """
+    for _ in range(2):
+        statement = update(OrderVersionModel).where(OrderVersionModel.id == 1).values(value=OrderVersionModel.value + 1)
+        # update_returning is a SQLAlchemy 2.0 dialect flag, 1.4 takes the fallback below
+        if getattr(session.get_bind().dialect, 'update_returning', False):
+            version = session.execute(statement.returning(OrderVersionModel.value)).scalar()
+        elif session.execute(statement).rowcount:
+            # Same transaction: the UPDATE holds the row lock, nobody else can change it before this read
+            version = session.query(OrderVersionModel.value).filter_by(id=1).scalar()
+        else:
+            version = None
+        if version is not None:
+            return version
+        # Counter row missing (database created before the startup check ran)
+        ensure_order_version_counter(session)
+    raise RuntimeError('OrderVersion counter row is missing')
+
+def order_delta(before, after):
+    """Compact order-delta payload: id, version and the fields that changed"""
+    return {
+        'id': after['id'],
+        'version': after['version'],
+        'changes': {field: after[field] for field in ORDER_DELTA_FIELDS if before.get(field) != after[field]}
+    }
+
+def bulk_create_orders(session, guest, orders_data, order_handler_id):
+    """Validate a cart and add its snapshots and orders in one flush
+    
+    All dishes are loaded with a single IN query and validated in cart order.
+    Snapshots and orders are then inserted as two batched INSERTs (multi-row
+    with RETURNING where the dialect supports it). The caller commits.
+    
+    Args:
+        orders_data: list of {'dishId', 'quantity', 'note'} items
+    
+    Returns:
+        list of flushed OrderModel (ids and defaults populated)
+    """
+    from flask import abort
+    
+    dish_ids = {order_data['dishId'] for order_data in orders_data}
+    dishes_by_id = {
+        dish.id: dish
+        for dish in session.query(DishModel).filter(DishModel.id.in_(dish_ids)).all()
+    } if dish_ids else {}
+    
+    for order_data in orders_data:
+        dish = dishes_by_id.get(order_data['dishId'])
+        if not dish:
+            abort(404)
+        
+        if dish.status == DishStatus.Unavailable:
+            raise ValueError(f'Món {dish.name} đã hết')
+        
+        if dish.status == DishStatus.Hidden:
+            raise ValueError(f'Món {dish.name} không thể đặt')
+    
+    orders = []
+    for order_data in orders_data:
+        dish = dishes_by_id[order_data['dishId']]
+        dish_snapshot = DishSnapshotModel(
+            name=dish.name,
+            price=dish.price,
+            description=dish.description,
+            image=dish.image,
+            status=dish.status,
+            category=getattr(dish, 'category', None),
+            dish_id=dish.id
+        )
+        # Linking through the relationship lets the flush insert every snapshot
+        # first and fill dish_snapshot_id, without a flush per item
+        order = OrderModel(
+            dish_snapshot=dish_snapshot,
+            guest_id=guest.id,
+            quantity=order_data['quantity'],
+            note=order_data.get('note'),
+            table_number=guest.table_number,
+            order_handler_id=order_handler_id,
+            status=OrderStatus.Pending
+        )
+        orders.append(order)
+    
+    version = next_order_version(session)
+    for order in orders:
+        order.version = version
+    session.add_all(orders)
+    session.flush()
+    return orders
 
 def create_orders_service(body):
     """Create orders"""
@@ -28,58 +150,15 @@ def create_orders_service(body):
         if table.status == TableStatus.Hidden:
             raise ValueError(f'Bàn {table.number} gắn liền với khách hàng đã bị ẩn, vui lòng chọn khách hàng khác!')
         
-        # Get socket record before creating orders
-        socket_record = session.query(SocketModel).filter_by(guest_id=guest_id).first()
-        
-        orders = []
-        for order_data in orders_data:
-            dish = session.query(DishModel).get(order_data['dishId'])
-            if not dish:
-                abort(404)
-            
-            if dish.status == DishStatus.Unavailable:
-                raise ValueError(f'Món {dish.name} đã hết')
-            
-            if dish.status == DishStatus.Hidden:
-                raise ValueError(f'Món {dish.name} không thể đặt')
-            
-            dish_snapshot = DishSnapshotModel(
-                name=dish.name,
-                price=dish.price,
-                description=dish.description,
-                image=dish.image,
-                status=dish.status,
-                category=getattr(dish, 'category', None),
-                dish_id=dish.id
-            )
-            session.add(dish_snapshot)
-            session.flush()
-            
-            order = OrderModel(
-                dish_snapshot_id=dish_snapshot.id,
-                guest_id=guest_id,
-                quantity=order_data['quantity'],
-                note=order_data.get('note'),
-                table_number=guest.table_number,
-                order_handler_id=g.current_user_id,
-                status=OrderStatus.Pending
-            )
-            session.add(order)
-            orders.append(order)
-        
+        orders = bulk_create_orders(session, guest, orders_data, g.current_user_id)
+        # Serialize before commit: ids and defaults are already set by the flush,
+        # and committing would expire them
+        orders_data = [order.to_dict() for order in orders]
+        refresh_daily_revenue_rollup(session, daily_revenue_keys(session, [order.id for order in orders]))
         session.commit()
         
-        # Refresh orders
-        for order in orders:
-            session.refresh(order)
-        
         # Emit socket event
-        orders_data = [order.to_dict() for order in orders]
-        socket_id = socket_record.socket_id if socket_record else None
-        if socket_id:
-            emit_to_manager_and_socket(socket_id, 'new-order', orders_data)
-        else:
-            emit_to_manager('new-order', orders_data)
+        emit_to_manager_and_socket(guest_room(guest_id), 'new-order', orders_data)
         
         return jsonify({
             'message': f'Tạo thành công {len(orders)} đơn hàng cho khách hàng',
@@ -88,94 +167,171 @@ def create_orders_service(body):
     finally:
         session.close()
 
+def _order_list_query(session, from_date=None, to_date=None, loader=joinedload):
+    """Base query for order listings (newest first, related rows eager-loaded)
+    
+    loader=selectinload for yield_per queries: joined eager loading can't be
+    batched, selectinload loads the related rows once per batch instead.
+    """
+    # Load snapshot, guest and handler in the same round trip (one query
+    # regardless of row count) instead of three lookups per order
+    query = session.query(OrderModel).options(
+        loader(OrderModel.dish_snapshot),
+        loader(OrderModel.guest),
+        loader(OrderModel.order_handler_account)
+    )
+    if from_date:
+        query = query.filter(OrderModel.created_at >= from_date)
+    if to_date:
+        query = query.filter(OrderModel.created_at <= to_date)
+    return query
+
+def _serialize_order_row(order):
+    """Serialize an order with dishSnapshot, guest and orderHandler included"""
+    order_dict = order.to_dict()
+    
+    dish_snapshot = order.dish_snapshot
+    if dish_snapshot:
+        order_dict['dishSnapshot'] = dish_snapshot.to_dict(resolve_image=True)
+    else:
+        # If dish_snapshot not found, set to null to prevent frontend errors
+        current_app.logger.warning(f"⚠️  DishSnapshot {order.dish_snapshot_id} not found for order {order.id}")
+        order_dict['dishSnapshot'] = None
+    
+    order_dict['guest'] = order.guest.to_dict() if order.guest else None
+    
+    # Order handler (account who created/updated the order)
+    order_handler = order.order_handler_account
+    order_dict['orderHandler'] = order_handler.to_dict() if order_handler else None
+    
+    return order_dict
+
+def _encode_order_cursor(order):
+    """Encode the (created_at, id) keyset position of an order as an opaque cursor"""
+    # created_at is stored as naive UTC; the explicit offset keeps the cursor unambiguous
+    created_at = order.created_at
+    created_at = created_at.replace(tzinfo=timezone.utc) if created_at.tzinfo is None else created_at.astimezone(timezone.utc)
+    raw = f"{created_at.isoformat()}|{order.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_order_cursor(cursor):
+    """Decode a cursor produced by _encode_order_cursor into (created_at, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, order_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|')
+        created_at = datetime.fromisoformat(created_at)
+        # Compared against the naive UTC column (cursors without an offset are already naive UTC)
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return created_at, int(order_id)
+    except (ValueError, UnicodeError):
+        raise EntityError([{'field': 'cursor', 'message': 'Cursor không hợp lệ'}])
+
 def get_orders_service(from_date=None, to_date=None):
     """Get orders"""
-    from infrastructure.models.dish_model import DishSnapshotModel
-    from infrastructure.models.guest_model import GuestModel
-    from infrastructure.models.account_model import AccountModel
-    from config import Config
-    
-    def _format_image_url(image_path):
-        """Format image URL to full URL if needed"""
-        if not image_path:
-            return None
-        
-        # If already a full URL, normalize it first (extract filename)
-        if image_path.startswith('http://') or image_path.startswith('https://'):
-            # Extract filename from URL (normalize production URLs to filename)
-            if '/static/' in image_path:
-                normalized_path = image_path.split('/static/')[-1]
-            else:
-                # Try to extract last part of URL
-                normalized_path = image_path.split('/')[-1]
-        else:
-            # Normalize path (remove leading slash and static/ prefix if exists)
-            normalized_path = str(image_path).lstrip('/')
-            if normalized_path.startswith('static/'):
-                normalized_path = normalized_path[7:]
-        
-        # If path is empty after normalization, return None
-        if not normalized_path:
-            return None
+    session = get_session()
+    try:
+        orders = _order_list_query(session, from_date, to_date).order_by(OrderModel.created_at.desc()).all()
+        orders_data = [_serialize_order_row(order) for order in orders]
         
-        # Get API URL from config instance
-        config = Config()
-        api_url = config.API_URL
-        result_url = f"{api_url}/static/{normalized_path}"
-        return result_url
+        return jsonify({
+            'message': 'Lấy danh sách đơn hàng thành công',
+            'data': orders_data
+        }), 200
+    finally:
+        session.close()
+
+def get_orders_page_service(from_date=None, to_date=None, cursor=None, limit=None):
+    """Get one page of orders using keyset pagination on (created_at, id)
+    
+    Args:
+        cursor: Opaque cursor returned as nextCursor by the previous page (None for the first page)
+        limit: Page size, capped at Config.ORDER_PAGE_SIZE_MAX
+    """
+    limit = min(max(limit or Config.ORDER_PAGE_SIZE_DEFAULT, 1), Config.ORDER_PAGE_SIZE_MAX)
     
     session = get_session()
     try:
-        query = session.query(OrderModel)
-        if from_date:
-            query = query.filter(OrderModel.created_at >= from_date)
-        if to_date:
-            query = query.filter(OrderModel.created_at <= to_date)
+        query = _order_list_query(session, from_date, to_date)
+        if cursor:
+            cursor_created_at, cursor_id = _decode_order_cursor(cursor)
+            query = query.filter(or_(
+                OrderModel.created_at < cursor_created_at,
+                and_(OrderModel.created_at == cursor_created_at, OrderModel.id < cursor_id)
+            ))
         
-        orders = query.order_by(OrderModel.created_at.desc()).all()
+        # Fetch one extra row to know whether another page exists
+        orders = query.order_by(OrderModel.created_at.desc(), OrderModel.id.desc()).limit(limit + 1).all()
+        has_more = len(orders) > limit
+        orders = orders[:limit]
         
-        # Build response with dishSnapshot and guest included
-        orders_data = []
-        for order in orders:
-            order_dict = order.to_dict()
-            
-            # Query dish_snapshot separately
-            dish_snapshot = session.query(DishSnapshotModel).get(order.dish_snapshot_id)
-            if dish_snapshot:
-                dish_snapshot_dict = dish_snapshot.to_dict()
-                # Format image URL to full URL
-                dish_snapshot_dict['image'] = _format_image_url(dish_snapshot_dict.get('image'))
-                order_dict['dishSnapshot'] = dish_snapshot_dict
-            else:
-                # If dish_snapshot not found, set to null to prevent frontend errors
-                current_app.logger.warning(f"⚠️  DishSnapshot {order.dish_snapshot_id} not found for order {order.id}")
-                order_dict['dishSnapshot'] = None
-            
-            # Query guest separately if exists
-            if order.guest_id:
-                guest = session.query(GuestModel).get(order.guest_id)
-                if guest:
-                    order_dict['guest'] = guest.to_dict()
-                else:
-                    order_dict['guest'] = None
-            else:
-                order_dict['guest'] = None
+        return jsonify({
+            'message': 'Lấy danh sách đơn hàng thành công',
+            'data': [_serialize_order_row(order) for order in orders],
+            'pagination': {
+                'limit': limit,
+                'hasMore': has_more,
+                'nextCursor': _encode_order_cursor(orders[-1]) if has_more else None
+            }
+        }), 200
+    finally:
+        session.close()
 
-            # Query order handler (account who created/updated the order) if exists
-            if order.order_handler_id:
-                order_handler = session.query(AccountModel).get(order.order_handler_id)
-                if order_handler:
-                    order_dict['orderHandler'] = order_handler.to_dict()
-                else:
-                    order_dict['orderHandler'] = None
-            else:
-                order_dict['orderHandler'] = None
+def stream_orders_service(from_date=None, to_date=None):
+    """Stream orders as a chunked JSON response, serializing rows as they come off the cursor"""
+    def generate():
+        session = get_session()
+        try:
+            query = _order_list_query(session, from_date, to_date, loader=selectinload).order_by(
+                OrderModel.created_at.desc(), OrderModel.id.desc()
+            ).yield_per(Config.ORDER_STREAM_BATCH_SIZE)
             
-            orders_data.append(order_dict)
+            # Same key order as jsonify (sorted keys): data first, then message
+            yield '{"data":['
+            separator = ''
+            for order in query:
+                yield separator + current_app.json.dumps(_serialize_order_row(order), separators=(',', ':'))
+                separator = ','
+            yield '],"message":' + current_app.json.dumps('Lấy danh sách đơn hàng thành công') + '}'
+        finally:
+            session.close()
+    
+    return Response(stream_with_context(generate()), mimetype='application/json'), 200
+
+def get_order_changes_service(since=0, limit=None):
+    """Orders changed after version `since`, to catch up after a socket reconnect
+    
+    Whole versions are returned together (an order batch or a payment shares
+    one version), so the next call can use the returned version as `since`.
+    
+    Args:
+        since: Highest order version the client has already applied
+        limit: Maximum number of versions returned, capped at Config.ORDER_PAGE_SIZE_MAX
+    """
+    limit = min(max(limit or Config.ORDER_PAGE_SIZE_DEFAULT, 1), Config.ORDER_PAGE_SIZE_MAX)
+    
+    session = get_session()
+    try:
+        versions = [version for version, in session.query(OrderModel.version).filter(
+            OrderModel.version > since
+        ).distinct().order_by(OrderModel.version).limit(limit + 1).all()]
+        has_more = len(versions) > limit
+        versions = versions[:limit]
+        
+        orders = []
+        if versions:
+            orders = _order_list_query(session).filter(
+                OrderModel.version >= versions[0],
+                OrderModel.version <= versions[-1]
+            ).order_by(OrderModel.version, OrderModel.id).all()
         
         return jsonify({
-            'message': 'Lấy danh sách đơn hàng thành công',
-            'data': orders_data
+            'message': 'Lấy thay đổi đơn hàng thành công',
+            'data': {
+                'orders': [_serialize_order_row(order) for order in orders],
+                'version': versions[-1] if versions else since,
+                'hasMore': has_more
+            }
         }), 200
     finally:
         session.close()
@@ -207,6 +363,10 @@ def update_order_service(order_id, body):
         dish_id = body.get('dishId')
         quantity = body.get('quantity')
         
+        # Rollup buckets the order leaves (dish change) and lands in
+        rollup_keys = daily_revenue_keys(session, [order_id])
+        previous_data = order.to_dict()
+        
         dish_snapshot_id = order.dish_snapshot_id
         if dish_id and order.dish_snapshot.dish_id != dish_id:
             dish = session.query(DishModel).get(dish_id)
@@ -229,18 +389,18 @@ def update_order_service(order_id, body):
         order.dish_snapshot_id = dish_snapshot_id
         order.quantity = quantity or order.quantity
         order.order_handler_id = g.current_user_id
+        order.version = next_order_version(session)
+        refresh_daily_revenue_rollup(session, rollup_keys | daily_revenue_keys(session, [order_id]))
         
-        socket_record = session.query(SocketModel).filter_by(guest_id=order.guest_id).first()
         session.commit()
         session.refresh(order)
         
         # Emit socket event
         order_data = order.to_dict()
-        socket_id = socket_record.socket_id if socket_record else None
-        if socket_id:
-            emit_to_manager_and_socket(socket_id, 'update-order', order_data)
+        if Config.ORDER_DELTA_EVENTS:
+            emit_to_manager_and_socket(guest_room(order.guest_id), 'order-delta', [order_delta(previous_data, order_data)])
         else:
-            emit_to_manager('update-order', order_data)
+            emit_to_manager_and_socket(guest_room(order.guest_id), 'update-order', order_data)
         
         return jsonify({
             'message': 'Cập nhật đơn hàng thành công',
@@ -263,12 +423,14 @@ def pay_orders_service(body):
             raise ValueError('Không có hóa đơn nào cần thanh toán')
         
         order_ids = [order.id for order in orders]
+        previous_data = {order.id: order.to_dict() for order in orders}
         session.query(OrderModel).filter(OrderModel.id.in_(order_ids)).update({
             'status': OrderStatus.Paid,
-            'order_handler_id': g.current_user_id
+            'order_handler_id': g.current_user_id,
+            'version': next_order_version(session)
         }, synchronize_session=False)
+        refresh_daily_revenue_rollup(session, daily_revenue_keys(session, order_ids))
         
-        socket_record = session.query(SocketModel).filter_by(guest_id=guest_id).first()
         session.commit()
         
         # Refresh orders
@@ -276,11 +438,11 @@ def pay_orders_service(body):
         orders_data = [order.to_dict() for order in paid_orders]
         
         # Emit socket event
-        socket_id = socket_record.socket_id if socket_record else None
-        if socket_id:
-            emit_to_manager_and_socket(socket_id, 'payment', orders_data)
+        if Config.ORDER_DELTA_EVENTS:
+            deltas = [order_delta(previous_data[order['id']], order) for order in orders_data]
+            emit_to_manager_and_socket(guest_room(guest_id), 'order-delta', deltas)
         else:
-            emit_to_manager('payment', orders_data)
+            emit_to_manager_and_socket(guest_room(guest_id), 'payment', orders_data)
         
         return jsonify({
             'message': f'Thanh toán thành công {len(paid_orders)} đơn',
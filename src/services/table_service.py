@@ -5,9 +5,27 @@ from infrastructure.models.guest_model import GuestModel
 from domain.exceptions import EntityError
 from utils.helpers import random_id
 from sqlalchemy.exc import IntegrityError
+from utils.cache_utils import VersionedCache
+from utils.http_cache import cached_json_response
+from config import Config
+
+# Serialized GET /tables responses
+table_cache = VersionedCache(ttl_seconds=Config.MENU_CACHE_TTL, max_entries=Config.MENU_CACHE_MAX_ENTRIES)
+
+def invalidate_table_cache():
+    """Drop cached table lists after a table is created, updated or deleted"""
+    table_cache.invalidate()
+
+def get_table_cache_stats():
+    """Hit/miss counters of the table list cache"""
+    return table_cache.stats()
 
 def get_table_list_service():
     """Get all tables"""
+    return cached_json_response(table_cache, 'list', _build_table_list_response)
+
+def _build_table_list_response():
+    """Query and serialize all tables (cache miss path of get_table_list_service)"""
     session = get_session()
     try:
         tables = session.query(TableModel).order_by(TableModel.created_at.desc()).all()
@@ -53,6 +71,7 @@ def create_table_service(body):
         )
         session.add(table)
         session.commit()
+        invalidate_table_cache()
         session.refresh(table)
         response = jsonify({
             'data': table.to_dict(),
@@ -90,6 +109,7 @@ def update_table_service(table_number, body):
         table.status = body.get('status', table.status)
         table.capacity = body.get('capacity', table.capacity)
         session.commit()
+        invalidate_table_cache()
         session.refresh(table)
         response = jsonify({
             'data': table.to_dict(),
@@ -110,6 +130,7 @@ def delete_table_service(table_number):
             abort(404)
         session.delete(table)
         session.commit()
+        invalidate_table_cache()
         response = jsonify({
             'data': table.to_dict(),
             'message': 'Xóa bàn thành công!'
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+class VersionedCache:
+    """In-process cache whose entries expire after a TTL or when the version is bumped
+    
+    Callers read `version` before loading data from the database and pass it back
+    to `set()`, so a value computed before a concurrent `invalidate()` is never stored.
+    A TTL <= 0 disables the cache.
+    """
+    
+    def __init__(self, ttl_seconds=60, max_entries=256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, expires_at, value = entry
+                if version == self.version and expires_at > now:
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key, value, version=None):
+        """Store value for key unless the cache was invalidated since `version` was read"""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Evict the oldest entry (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (self.version, time.monotonic() + self.ttl_seconds, value)
+    
+    def invalidate(self):
+        """Drop every entry and bump the version"""
+        with self._lock:
+            self.version += 1
+            self.invalidations += 1
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'version': self.version,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': self.hits / total if total else 0.0,
+                'invalidations': self.invalidations
+            }
+
+class ExpiringLRUCache:
+    """Bounded LRU cache whose entries carry their own expiry time (epoch seconds)
+    
+    Used for values that are valid until a known deadline, e.g. verified JWT
+    claims until their `exp`. max_entries <= 0 disables the cache.
+    """
+    
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or when it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key, value, expires_at):
+        """Store value for key until expires_at, evicting the least recently used entry"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def pop(self, key):
+        """Drop the entry for key if there is one"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxEntries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': self.hits / total if total else 0.0,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,173 @@
+import threading
+import time
+import zlib
+from flask import request
+from config import Config
+from utils.cache_utils import ExpiringLRUCache
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional: without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript',
+    'application/xml', 'image/svg+xml'
+}
+
+# Bodies of responses with a strong ETag (menu/table cache hits) compressed once per encoding
+COMPRESSED_BODY_CACHE_SIZE = 128
+COMPRESSED_BODY_CACHE_TTL = 3600
+
+compressed_body_cache = ExpiringLRUCache(COMPRESSED_BODY_CACHE_SIZE)
+
+class CompressionStats:
+    """Counters per encoding: responses compressed, bytes before and after"""
+    
+    def __init__(self):
+        self.skipped_small = 0
+        self.skipped_incompressible = 0
+        self._encodings = {}
+        self._lock = threading.Lock()
+    
+    def record(self, encoding, bytes_in, bytes_out):
+        with self._lock:
+            counters = self._encodings.setdefault(encoding, {'responses': 0, 'bytesIn': 0, 'bytesOut': 0})
+            counters['responses'] += 1
+            counters['bytesIn'] += bytes_in
+            counters['bytesOut'] += bytes_out
+    
+    def skip(self, too_small):
+        with self._lock:
+            if too_small:
+                self.skipped_small += 1
+            else:
+                self.skipped_incompressible += 1
+    
+    def stats(self):
+        with self._lock:
+            encodings = {
+                encoding: dict(counters, bytesSaved=counters['bytesIn'] - counters['bytesOut'])
+                for encoding, counters in self._encodings.items()
+            }
+            return {
+                'enabled': Config.COMPRESSION_ENABLED,
+                'encodings': encodings,
+                'bytesSaved': sum(counters['bytesSaved'] for counters in encodings.values()),
+                'skippedSmall': self.skipped_small,
+                'skippedIncompressible': self.skipped_incompressible
+            }
+
+compression_stats = CompressionStats()
+
+class StreamCompressor:
+    """Incremental gzip/brotli compressor, flushed after every chunk of a streamed body"""
+    
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=Config.BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(Config.COMPRESSION_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    
+    def compress(self, data):
+        """Compressed bytes for data, flushed so the client can decode them right away"""
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+def available_encodings():
+    """Encodings we can produce, preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.BROTLI_QUALITY)
+    compressor = zlib.compressobj(Config.COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+def _compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    bytes_in = bytes_out = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if not chunk:
+                continue
+            compressed = compressor.compress(chunk)
+            bytes_in += len(chunk)
+            bytes_out += len(compressed)
+            yield compressed
+        tail = compressor.finish()
+        bytes_out += len(tail)
+        yield tail
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        compression_stats.record(encoding, bytes_in, bytes_out)
+
+def is_compressible(response):
+    """Textual 2xx bodies that nothing has encoded yet; file responses (send_file, images) are left alone"""
+    if request.method == 'HEAD' or not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+def compress_response(response):
+    """after_request hook: gzip/brotli the body when the client accepts it"""
+    if not Config.COMPRESSION_ENABLED or not is_compressible(response):
+        return response
+    # The body depends on Accept-Encoding even when this client gets it uncompressed
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        # Size unknown up front: compress chunk by chunk, keeping the stream incremental
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < Config.COMPRESSION_MIN_SIZE:
+            compression_stats.skip(too_small=True)
+            return response
+        
+        etag, weak = response.get_etag()
+        cache_key = (encoding, etag) if etag and not weak else None
+        compressed = compressed_body_cache.get(cache_key) if cache_key else None
+        if compressed is None:
+            compressed = compress_body(data, encoding)
+            if cache_key:
+                compressed_body_cache.set(cache_key, compressed, time.time() + COMPRESSED_BODY_CACHE_TTL)
+        if len(compressed) >= len(data):
+            compression_stats.skip(too_small=False)
+            return response
+        response.set_data(compressed)
+        compression_stats.record(encoding, len(data), len(compressed))
+    
+    response.headers['Content-Encoding'] = encoding
+    # Same content, different bytes: the identity ETag may only match weakly now
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def setup_compression(app):
+    """Register the compression hook; call before other after_request hooks so it runs last"""
+    app.after_request(compress_response)
+
+def get_compression_stats():
+    """Compressed responses and bytes saved per encoding"""
+    return compression_stats.stats()
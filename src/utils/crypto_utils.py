@@ -1,10 +1,37 @@
 import bcrypt
+from config import Config
+
+try:
+    # Under the eventlet async mode bcrypt must leave the hub thread, otherwise
+    # every greenthread (Socket.IO included) stalls while a password is hashed
+    from eventlet import tpool
+    from greenlet import getcurrent
+except ImportError:
+    tpool = None
+    getcurrent = None
+
+def _offload(func, *args):
+    """Run a blocking bcrypt call off the eventlet hub, inline on a plain OS thread"""
+    if tpool is not None and getcurrent().parent is not None:
+        # Running inside an eventlet greenthread: use eventlet's OS thread pool
+        return tpool.execute(func, *args)
+    # Request threads (threading async mode, scripts): bcrypt releases the GIL,
+    # handing it to another thread would only block this one while it waits
+    return func(*args)
 
 def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    """Hash password using bcrypt (cost factor from Config.BCRYPT_ROUNDS)"""
+    salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+    return _offload(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
 
 def compare_password(password: str, hashed: str) -> bool:
     """Compare password with hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return _offload(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
+def password_needs_rehash(hashed: str) -> bool:
+    """True when the hash was made with a cost factor other than Config.BCRYPT_ROUNDS"""
+    try:
+        # bcrypt hashes look like $2b$<cost>$<salt+hash>
+        return int(hashed.split('$')[2]) != Config.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
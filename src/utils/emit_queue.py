@@ -0,0 +1,87 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+# Events whose latest payload replaces earlier ones for the same id within a window
+COALESCED_EVENTS = ('update-order', 'update-dish')
+
+class RoomEmitQueue:
+    """Outbound socket events buffered per room and flushed together after a short window
+    
+    The first event queued for a room schedules a background flush `window_seconds`
+    later, so HTTP handlers return before any socket I/O. Within the window a
+    newer COALESCED_EVENTS payload for the same id drops the older one. With
+    `single_events` every remaining event is emitted on its own (what existing
+    clients expect); otherwise the room gets one 'batch' event with the list of
+    {'event', 'data'} in order.
+    """
+    
+    def __init__(self, get_socketio, window_seconds=0.05, single_events=True):
+        self._get_socketio = get_socketio
+        self.window_seconds = window_seconds
+        self.single_events = single_events
+        self._pending = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.superseded = 0
+        self.flushes = 0
+        self.frames = 0
+    
+    def _coalesce_key(self, event, data):
+        if event in COALESCED_EVENTS and isinstance(data, dict) and data.get('id') is not None:
+            return (event, data['id'])
+        return ('seq', next(self._sequence))
+    
+    def put(self, room, event, data):
+        """Queue an event for room, return False when Socket.IO is not initialized"""
+        socketio = self._get_socketio()
+        if not socketio:
+            return False
+        if self.window_seconds <= 0:
+            socketio.emit(event, data, room=room)
+            return True
+        
+        key = self._coalesce_key(event, data)
+        with self._lock:
+            self.enqueued += 1
+            events = self._pending.get(room)
+            schedule_flush = events is None
+            if schedule_flush:
+                events = self._pending[room] = OrderedDict()
+            if events.pop(key, None) is not None:
+                self.superseded += 1
+            events[key] = (event, data)
+        if schedule_flush:
+            socketio.start_background_task(self._flush_later, socketio, room)
+        return True
+    
+    def _flush_later(self, socketio, room):
+        socketio.sleep(self.window_seconds)
+        self.flush(socketio, room)
+    
+    def flush(self, socketio, room):
+        """Emit everything queued for room"""
+        with self._lock:
+            events = self._pending.pop(room, None)
+            if not events:
+                return
+            self.flushes += 1
+            self.frames += len(events) if self.single_events else 1
+        if self.single_events:
+            for event, data in events.values():
+                socketio.emit(event, data, room=room)
+        else:
+            socketio.emit('batch', [{'event': event, 'data': data} for event, data in events.values()], room=room)
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'windowSeconds': self.window_seconds,
+                'singleEvents': self.single_events,
+                'pendingRooms': len(self._pending),
+                'enqueued': self.enqueued,
+                'superseded': self.superseded,
+                'flushes': self.flushes,
+                'frames': self.frames
+            }
@@ -0,0 +1,29 @@
+from flask import current_app
+from werkzeug.http import generate_etag
+
+def cached_json_response(cache, key, build):
+    """Serve a JSON response body from `cache`, tagged with a strong ETag
+    
+    `build()` is only called on a cache miss and must return (response, status).
+    Non-200 responses are returned as is and never cached. The ETag is derived from
+    the body, so the after_request hook in create_app can answer If-None-Match
+    with 304 straight from the cached entry, without touching the database.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        # Read before building so a concurrent invalidation prevents storing stale data
+        version = cache.version
+        response, status = build()
+        if status != 200:
+            return response, status
+        body = response.get_data()
+        entry = (body, generate_etag(body))
+        cache.set(key, entry, version=version)
+    
+    body, etag = entry
+    response = current_app.response_class(body, mimetype='application/json')
+    response.headers['Content-Type'] = 'application/json; charset=utf-8'
+    response.set_etag(etag)
+    # Let clients keep the body but revalidate it on every request
+    response.headers['Cache-Control'] = 'no-cache'
+    return response, 200
@@ -0,0 +1,36 @@
+from functools import lru_cache
+from config import Config
+
+# API_URL only depends on settings read at startup, resolve it once
+STATIC_BASE_URL = f'{Config().API_URL}/static'
+
+def normalize_image_path(image_path):
+    """Path stored in the database: the file name under /static ('' when there is none)
+    
+    Accepts full URLs (any host, e.g. old production URLs), '/static/x.jpg',
+    'static/x.jpg' and bare file names.
+    """
+    if not image_path:
+        return ''
+    image_path = str(image_path).strip()
+    
+    if image_path.startswith('http://') or image_path.startswith('https://'):
+        # Extract filename from URL like: http://localhost:4000/static/filename.jpg
+        if '/static/' in image_path:
+            return image_path.split('/static/')[-1]
+        # If URL doesn't have /static/, try to extract last part
+        return image_path.split('/')[-1]
+    
+    # Remove leading slash and 'static/' if exists
+    normalized = image_path.lstrip('/')
+    if normalized.startswith('static/'):
+        normalized = normalized[7:]
+    return normalized
+
+@lru_cache(maxsize=4096)
+def image_url(image_path):
+    """Public URL of a stored image path, None when there is no image (memoized per path)"""
+    normalized = normalize_image_path(image_path)
+    if not normalized.strip():
+        return None
+    return f'{STATIC_BASE_URL}/{normalized}'
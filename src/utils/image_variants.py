@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache_utils import ExpiringLRUCache
+from utils.logging_utils import get_logger
+from config import Config
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    # Pillow is optional: without it uploads are served as-is
+    Image = None
+
+logger = get_logger(__name__)
+
+# Target widths; an image narrower than a target is not upscaled
+VARIANT_WIDTHS = {'thumb': 160, 'card': 480, 'full': 1280}
+FORMAT_EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+MANIFEST_SUFFIX = '.variants.json'
+# A missing manifest is usually still being generated, look again soon
+PENDING_MANIFEST_TTL = 10
+
+# Pillow releases the GIL while decoding, resizing and encoding
+_variant_executor = ThreadPoolExecutor(max_workers=Config.IMAGE_VARIANT_WORKERS, thread_name_prefix='image-variants')
+manifest_cache = ExpiringLRUCache(Config.STATIC_STAT_CACHE_SIZE)
+
+def variant_formats():
+    """Configured output formats this Pillow build can encode"""
+    if Image is None:
+        return []
+    formats = []
+    for fmt in Config.IMAGE_VARIANT_FORMATS:
+        if fmt == 'jpeg' or (fmt in FORMAT_EXTENSIONS and features.check(fmt)):
+            formats.append(fmt)
+    return formats
+
+def variant_file_name(filename, variant, fmt):
+    """e.g. abc123.png -> abc123_card.webp"""
+    stem = os.path.splitext(filename)[0]
+    return f'{stem}_{variant}.{FORMAT_EXTENSIONS[fmt]}'
+
+def _manifest_path(filename):
+    return os.path.join(Config.UPLOAD_FOLDER, os.path.splitext(filename)[0] + MANIFEST_SUFFIX)
+
+def _replace_atomically(path, write):
+    """Write to a temporary file and rename it, readers never see a partial file"""
+    tmp_path = f'{path}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def generate_variants(filename):
+    """Write the resized variants of an uploaded image and its manifest, return the manifest"""
+    formats = variant_formats()
+    if not formats:
+        return None
+    
+    source_path = os.path.join(Config.UPLOAD_FOLDER, filename)
+    with Image.open(source_path) as source:
+        # Apply the EXIF orientation of phone photos before resizing
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        opaque = image
+        if image.mode == 'RGBA':
+            # JPEG has no alpha channel: flatten on white
+            opaque = Image.new('RGB', image.size, (255, 255, 255))
+            opaque.paste(image, mask=image.getchannel('A'))
+        
+        manifest = {'source': filename, 'width': image.width, 'height': image.height, 'variants': {fmt: [] for fmt in formats}}
+        done_widths = set()
+        for variant, target_width in sorted(VARIANT_WIDTHS.items(), key=lambda item: item[1]):
+            width = min(target_width, image.width)
+            if width in done_widths:
+                continue
+            done_widths.add(width)
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+            resized_opaque = opaque.resize((width, height), Image.LANCZOS) if width != image.width else opaque
+            for fmt in formats:
+                name = variant_file_name(filename, variant, fmt)
+                frame = resized_opaque if fmt == 'jpeg' else resized
+                _replace_atomically(
+                    os.path.join(Config.UPLOAD_FOLDER, name),
+                    lambda path: frame.save(path, format=fmt.upper(), quality=Config.IMAGE_VARIANT_QUALITY)
+                )
+                manifest['variants'][fmt].append({'name': name, 'width': width})
+    
+    def write_manifest(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+    _replace_atomically(_manifest_path(filename), write_manifest)
+    manifest_cache.set(filename, manifest, time.time() + Config.STATIC_STAT_CACHE_TTL)
+    return manifest
+
+def _generate_in_background(filename, on_done):
+    started = time.perf_counter()
+    try:
+        manifest = generate_variants(filename)
+    except Exception:
+        logger.exception('Failed to generate image variants for %s', filename)
+        return
+    logger.info('Image variants for %s generated in %.0f ms', filename, (time.perf_counter() - started) * 1000)
+    if manifest and on_done:
+        on_done(filename)
+
+def schedule_variants(filename, on_done=None):
+    """Queue variant generation for an upload; False when it is disabled or Pillow is missing"""
+    if not Config.IMAGE_VARIANTS_ENABLED or not variant_formats():
+        return False
+    _variant_executor.submit(_generate_in_background, filename, on_done)
+    return True
+
+def load_manifest(filename):
+    """Manifest of an uploaded image, None while it is pending or when there is none"""
+    filename = os.path.basename(filename or '')
+    if not filename:
+        return None
+    cached = manifest_cache.get(filename)
+    if cached is not None:
+        return cached or None
+    try:
+        with open(_manifest_path(filename), encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest_cache.set(filename, manifest, time.time() + Config.STATIC_STAT_CACHE_TTL)
+        return manifest
+    except (OSError, ValueError):
+        manifest_cache.set(filename, False, time.time() + PENDING_MANIFEST_TTL)
+        return None
+
+def image_srcset(filename, base_url):
+    """{format: 'url 160w, url 480w, ...'} for an uploaded image, None without variants"""
+    manifest = load_manifest(filename)
+    if not manifest:
+        return None
+    return {
+        fmt: ', '.join(f"{base_url}/{item['name']} {item['width']}w" for item in items)
+        for fmt, items in manifest['variants'].items()
+    }
@@ -1,7 +1,16 @@
 import jwt
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from config import Config
 from typing import Dict, Optional
+from utils.cache_utils import ExpiringLRUCache
+
+# Verified access token claims keyed by token digest, valid until the token's exp
+access_token_cache = ExpiringLRUCache(Config.ACCESS_TOKEN_CACHE_SIZE)
+_decode_lock = threading.Lock()
+_decode_stats = {'count': 0, 'seconds': 0.0}
 
 def parse_time_string(time_str: str) -> timedelta:
     """Parse time string like '15m', '7d', '1h' to timedelta"""
@@ -52,16 +61,39 @@ def sign_refresh_token(payload: Dict, expires_in: Optional[timedelta] = None) ->
     return jwt.encode(payload, Config.REFRESH_TOKEN_SECRET, algorithm='HS256')
 
 def verify_access_token(token: str) -> Dict:
-    """Verify access token"""
+    """Verify access token (verified claims are cached until the token expires)"""
+    cache_key = hashlib.sha256(token.encode('utf-8')).digest()
+    cached = access_token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
+    started = time.perf_counter()
     try:
         decoded = jwt.decode(token, Config.ACCESS_TOKEN_SECRET, algorithms=['HS256'])
         if decoded.get('tokenType') != 'AccessToken':
             raise ValueError('Invalid token type')
-        return decoded
     except jwt.ExpiredSignatureError:
         raise ValueError('Token expired')
     except jwt.InvalidTokenError:
         raise ValueError('Invalid token')
+    finally:
+        with _decode_lock:
+            _decode_stats['count'] += 1
+            _decode_stats['seconds'] += time.perf_counter() - started
+    
+    # Only cache tokens that expire; invalid tokens are never cached
+    if 'exp' in decoded:
+        access_token_cache.set(cache_key, dict(decoded), decoded['exp'])
+    return decoded
+
+def get_access_token_cache_stats() -> Dict:
+    """Hit ratio of the access token cache and time spent in jwt.decode"""
+    stats = access_token_cache.stats()
+    with _decode_lock:
+        stats['decodeCount'] = _decode_stats['count']
+        stats['decodeSecondsTotal'] = _decode_stats['seconds']
+        stats['decodeSecondsAvg'] = _decode_stats['seconds'] / _decode_stats['count'] if _decode_stats['count'] else 0.0
+    return stats
 
 def verify_refresh_token(token: str) -> Dict:
     """Verify refresh token"""
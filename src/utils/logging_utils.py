@@ -0,0 +1,135 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+from config import Config
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+_listener = None
+
+def get_logger(name):
+    """Logger under the application namespace, configured by setup_logging()"""
+    return logging.getLogger(f'app.{name}')
+
+def get_request_id():
+    """Id of the current request, '-' outside of a request"""
+    if has_request_context():
+        return g.get('request_id', '-')
+    return '-'
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request that produced them"""
+    
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = get_request_id()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records below WARNING, warnings and errors always pass"""
+    
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, fields passed with `extra=` are kept"""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'requestId': getattr(record, 'request_id', '-'),
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def _default_level():
+    """LOG_LEVEL if set, else WARNING in production and INFO otherwise"""
+    if Config.LOG_LEVEL:
+        return Config.LOG_LEVEL.upper()
+    return 'WARNING' if Config.PRODUCTION else 'INFO'
+
+def setup_logging(app):
+    """Route app, Flask and library logs through a queue drained by a background thread
+    
+    Request threads only put records on the queue; formatting and the stdout write
+    happen in the listener thread. Every request gets an id (X-Request-ID is reused
+    when the proxy sends one) that is attached to its log records and echoed back.
+    """
+    global _listener
+    level = _default_level()
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if Config.LOG_FORMAT == 'json':
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'))
+    
+    # The filters run on the calling thread, while the request context is still there
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(Config.LOG_SAMPLE_RATE))
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    logging.getLogger('app').setLevel(level)
+    # Dev server access logs follow the level but never drop to DEBUG
+    logging.getLogger('werkzeug').setLevel(max(logging.getLevelName(level), logging.INFO))
+    # Socket.IO logs every packet at INFO, only show them when debugging
+    socket_level = level if level == 'DEBUG' else 'WARNING'
+    logging.getLogger('app.socketio').setLevel(socket_level)
+    logging.getLogger('app.engineio').setLevel(socket_level)
+    
+    # app.logger propagates to the root handler instead of writing to stderr itself
+    from flask.logging import default_handler
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(level)
+    
+    if _listener is not None:
+        _listener.stop()
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    
+    @app.after_request
+    def echo_request_id(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
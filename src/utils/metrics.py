@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request, request_finished
+from config import Config
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# SQL statements per request: an N+1 regression moves a route into the upper buckets
+DB_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def format_labels(labels):
+    """{'route': '/orders'} -> '{route="/orders"}' ('' without labels)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_family(name, documentation, kind, samples):
+    """Prometheus text lines for one metric family, samples are (labels dict, value)"""
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} {kind}']
+    lines.extend(f'{name}{format_labels(labels)} {format_value(value)}' for labels, value in samples)
+    return lines
+
+class Counter:
+    """Monotonic counter keyed by label values (thread-safe)"""
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self):
+        with self._lock:
+            samples = [(dict(zip(self.labelnames, labels)), value) for labels, value in sorted(self._values.items())]
+        return render_family(self.name, self.documentation, 'counter', samples)
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values (thread-safe)"""
+    
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # Per-bucket counts (made cumulative when rendered), sum, count
+                entry = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+    
+    def render(self):
+        with self._lock:
+            values = [(labels, list(counts), total, count) for labels, (counts, total, count) in sorted(self._values.items())]
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total, count in values:
+            label_dict = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{format_labels({**label_dict, "le": format_value(float(bound))})} {cumulative}')
+            lines.append(f'{self.name}_bucket{format_labels({**label_dict, "le": "+Inf"})} {count}')
+            lines.append(f'{self.name}_sum{format_labels(label_dict)} {format_value(total)}')
+            lines.append(f'{self.name}_count{format_labels(label_dict)} {count}')
+        return lines
+
+class ThreadCounters(threading.local):
+    """Running totals of the current thread, diffed at the end of each request
+    
+    Engine and ORM events only bump plain attributes here, no lock and no
+    context lookup per statement or loaded row.
+    """
+    statements = 0
+    statement_seconds = 0.0
+    rows = 0
+    serialize_seconds = 0.0
+    
+    def snapshot(self):
+        return (self.statements, self.statement_seconds, self.rows, self.serialize_seconds)
+
+thread_counters = ThreadCounters()
+
+http_requests = Counter('app_http_requests_total', 'HTTP requests by route and status', ('method', 'route', 'status'))
+http_latency = Histogram('app_http_request_duration_seconds', 'Time to build the response (streamed bodies excluded)', LATENCY_BUCKETS, ('method', 'route'))
+http_db_statements = Histogram('app_http_request_db_statements', 'SQL statements executed per request', DB_STATEMENT_BUCKETS, ('method', 'route'))
+http_db_seconds = Histogram('app_http_request_db_seconds', 'Time spent in SQL statements per request', LATENCY_BUCKETS, ('method', 'route'))
+http_db_rows = Counter('app_http_request_db_rows_total', 'ORM rows loaded while handling requests', ('method', 'route'))
+http_serialize_seconds = Histogram('app_http_request_serialize_seconds', 'JSON encoding time per request', DB_TIME_BUCKETS, ('method', 'route'))
+db_statements = Counter('app_db_statements_total', 'SQL statements executed, in and outside of requests')
+db_statement_seconds = Histogram('app_db_statement_duration_seconds', 'Duration of single SQL statements', DB_TIME_BUCKETS)
+
+REQUEST_METRICS = (http_requests, http_latency, http_db_statements, http_db_seconds, http_db_rows, http_serialize_seconds, db_statements, db_statement_seconds)
+
+def record_statement(seconds):
+    """Called by the engine listeners after every SQL statement"""
+    thread_counters.statements += 1
+    thread_counters.statement_seconds += seconds
+    db_statements.inc()
+    db_statement_seconds.observe(seconds)
+
+def count_loaded_row(target, context):
+    """ORM 'load' listener: one mapped object built from a result row"""
+    thread_counters.rows += 1
+
+def record_serialization(seconds):
+    thread_counters.serialize_seconds += seconds
+
+def _start_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_counters = thread_counters.snapshot()
+
+def _finish_request(sender, response, **extra):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return
+    statements, statement_seconds, rows, serialize_seconds = (
+        now - before for now, before in zip(thread_counters.snapshot(), g.pop('metrics_counters'))
+    )
+    # The rule ('/orders/<int:order_id>'), not the path, keeps the label set bounded
+    labels = (request.method, request.url_rule.rule if request.url_rule else 'unmatched')
+    http_requests.inc(labels + (str(response.status_code),))
+    http_latency.observe(time.perf_counter() - started, labels)
+    http_db_statements.observe(statements, labels)
+    http_db_seconds.observe(statement_seconds, labels)
+    if rows:
+        http_db_rows.inc(labels, rows)
+    if serialize_seconds:
+        http_serialize_seconds.observe(serialize_seconds, labels)
+
+def setup_metrics(app):
+    """Time every request and attribute the SQL statements run on its thread to its route
+    
+    Recorded when Flask has finished the response (after every after_request hook).
+    """
+    if not Config.METRICS_ENABLED:
+        return
+    app.before_request(_start_request)
+    request_finished.connect(_finish_request, app)
+
+def render_request_metrics():
+    lines = []
+    for metric in REQUEST_METRICS:
+        lines.extend(metric.render())
+    return lines
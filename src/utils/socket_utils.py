@@ -1,26 +1,33 @@
-from plugins.socket_plugin import get_socketio
+from plugins.socket_plugin import get_socketio, guest_room, account_room
 from domain.constants import ManagerRoom
+from utils.emit_queue import RoomEmitQueue
+from config import Config
+from utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Events are coalesced per room and flushed by a background task after a short window
+emit_queue = RoomEmitQueue(
+    get_socketio,
+    window_seconds=Config.SOCKET_EMIT_WINDOW_MS / 1000.0,
+    single_events=Config.SOCKET_EMIT_SINGLE_EVENTS
+)
 
 def emit_to_manager(event, data):
     """Emit event to manager room"""
-    socketio = get_socketio()
-    if socketio:
-        socketio.emit(event, data, room=ManagerRoom)
-        print(f"📡 Emitted '{event}' to manager room: {data}")
-    else:
-        print(f"⚠️  SocketIO not available, cannot emit '{event}'")
+    if not emit_queue.put(ManagerRoom, event, data):
+        logger.warning("SocketIO not available, cannot emit '%s'", event)
 
-def emit_to_socket(socket_id, event, data):
-    """Emit event to specific socket"""
-    socketio = get_socketio()
-    if socketio and socket_id:
-        socketio.emit(event, data, room=socket_id)
+def emit_to_socket(room, event, data):
+    """Emit event to a user's sockets (guest_room / account_room) or a single socket id"""
+    if room:
+        emit_queue.put(room, event, data)
 
-def emit_to_manager_and_socket(socket_id, event, data):
-    """Emit event to manager room and specific socket"""
-    socketio = get_socketio()
-    if socketio:
-        socketio.emit(event, data, room=ManagerRoom)
-        if socket_id:
-            socketio.emit(event, data, room=socket_id)
+def emit_to_manager_and_socket(room, event, data):
+    """Emit event to manager room and to a user's sockets"""
+    if emit_queue.put(ManagerRoom, event, data) and room:
+        emit_queue.put(room, event, data)
 
+def get_emit_queue_stats():
+    """Counters of the outbound socket event queue"""
+    return emit_queue.stats()